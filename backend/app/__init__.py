@@ -1,35 +1,110 @@
-from flask import Flask
-from flask_cors import CORS
+from flask import Flask, current_app, jsonify
+from flask.json.provider import JSONProvider
+from decimal import Decimal
+from typing import Optional
+import orjson
+from werkzeug.exceptions import RequestEntityTooLarge
 from config.settings import Config
-from app.extensions import bcrypt, jwt
-from app.core.video_service import VideoService
-import os
+from app.extensions import bcrypt, jwt, mongo
+from app.models.user import User
+from app.utils.routing import CachingMap
+from app.utils.cors import FastCORS
+from app.utils.uploads import SpoolingRequest
+from app.utils.language_utils import init_fonts
+from app.core import video_service as video_service_module
+from app.core.video_service import get_video_service
+
+def _orjson_default(obj):
+    if isinstance(obj, Decimal):
+        return str(obj)
+    if hasattr(obj, '__html__'):
+        return str(obj.__html__())
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+class ORJSONProvider(JSONProvider):
+    """JSON provider backed by orjson; also handles numpy scalars/arrays"""
+    option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=_orjson_default, option=self.option).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+def _load_jwt_keys(app):
+    """Parse PEM keys for asymmetric JWT algorithms once instead of on every token"""
+    if app.config['JWT_ALGORITHM'].startswith('HS'):
+        return
+    from cryptography.hazmat.primitives import serialization
+
+    private_key = app.config.get('JWT_PRIVATE_KEY')
+    if isinstance(private_key, str):
+        app.config['JWT_PRIVATE_KEY'] = serialization.load_pem_private_key(private_key.encode(), password=None)
+    public_key = app.config.get('JWT_PUBLIC_KEY')
+    if isinstance(public_key, str):
+        app.config['JWT_PUBLIC_KEY'] = serialization.load_pem_public_key(public_key.encode())
+
+class VidsubFlask(Flask):
+    url_map_class = CachingMap
+    request_class = SpoolingRequest
+
+    @property
+    def video_service(self):
+        # Created on first use so workers don't pay for it at boot
+        return get_video_service()
+
+def _handle_too_large(error):
+    # Werkzeug raises this from the body stream before an oversized upload is read
+    limit_mb = current_app.config['MAX_CONTENT_LENGTH'] // (1024 * 1024)
+    return jsonify({'error': f'File size exceeds maximum limit ({limit_mb}MB)'}), 413
 
 def create_app(config_class=Config):
-    app = Flask(__name__)
+    app = VidsubFlask(__name__)
+    app.json = ORJSONProvider(app)
     app.config.from_object(config_class)
     
-    # Set Groq API key from environment
-    app.config['GROQ_API_KEY'] = os.getenv('GROQ_API_KEY')
-    
-    CORS(app, 
-         origins=["http://127.0.0.1:5000", "http://localhost:3000"],
-         allow_headers=["*"],
-         expose_headers=["*"],
-         methods=["GET", "POST", "PUT", "DELETE", "OPTIONS", "PATCH"],
-         supports_credentials=True,
-         max_age=3600)
+    app.wsgi_app = FastCORS(app.wsgi_app, app.config['CORS_ORIGINS'])
     
     bcrypt.init_app(app)
+    mongo.init_app(app)
+    _load_jwt_keys(app)
     jwt.init_app(app)
+
+    if app.config.get('MONGODB_URI'):
+        User.ensure_indexes()
+        # Don't carry this client's monitor threads and sockets into forked workers
+        mongo.close()
+
+    # Once per app rather than on every import; under preload_app only the master pays
+    if app.config.get('INIT_FONTS'):
+        init_fonts()
     
-    # Initialize VideoService
-    app.video_service = VideoService()
-    
+    # Rules inherit this when bound, so no trailing-slash redirect branch
+    app.url_map.strict_slashes = False
+
     from app.routes.auth import auth_bp
     from app.routes.video import video_bp
     
     app.register_blueprint(auth_bp, url_prefix='/api/auth')
     app.register_blueprint(video_bp, url_prefix='/api/video')
+    app.register_error_handler(RequestEntityTooLarge, _handle_too_large)
     
-    return app
\ No newline at end of file
+    return app
+
+_app_singleton: Optional[Flask] = None
+
+def get_or_create_app(config_class=Config):
+    """Return a shared app, creating it on first call (for tests and scripts)"""
+    global _app_singleton
+    if _app_singleton is None:
+        _app_singleton = create_app(config_class)
+    return _app_singleton
+
+def reset_app_state(app):
+    """Clear per-process caches so a shared app can be reused between tests"""
+    from app.routes.video import clear_video_cache
+
+    jwt.clear_token_cache()
+    clear_video_cache()
+    if video_service_module._video_service is not None:
+        video_service_module._video_service.reset_caches()
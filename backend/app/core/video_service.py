@@ -1,22 +1,132 @@
+import io
 import os
 import sys
+import asyncio
 import groq
 import ffmpeg
 import json
+import orjson
 import uuid
-import requests
-from typing import Generator, Optional, List, Dict
-from flask import current_app
+import shutil
+import subprocess
+import tempfile
+import itertools
+import threading
+import time
+import wave
+from concurrent.futures import ThreadPoolExecutor
+from fractions import Fraction
+from functools import lru_cache
+from typing import Callable, Generator, Optional, List, Dict
 from bson import ObjectId
-from transformers import MarianMTModel, MarianTokenizer
+from cachetools import LRUCache
 from datetime import datetime
+from config.settings import Config
 from ..utils.language_utils import get_font_path, normalize_lang_code
+from ..utils.media import clear_probe_cache, probe_video
 from ..models.video import Video
 import logging
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Segments per MarianMT forward pass
+TRANSLATION_BATCH_SIZE = 32
+# Concurrent Groq requests per job
+GROQ_MAX_CONCURRENCY = 12
+# Per-chunk retries for transient Groq failures, with exponential backoff from GROQ_RETRY_BACKOFF seconds
+GROQ_CHUNK_RETRIES = 3
+GROQ_RETRY_BACKOFF = 1.0
+GROQ_RETRYABLE_ERRORS = (groq.RateLimitError, groq.APIConnectionError, groq.InternalServerError)
+# Long audio is transcribed in overlapping chunks; 300s of 16kHz mono WAV
+# stays well under Groq's 25MB upload limit
+AUDIO_CHUNK_SECONDS = 300
+AUDIO_CHUNK_OVERLAP = 2.0
+# A tail shorter than this is folded into the previous chunk instead of being
+# uploaded on its own (Whisper rejects near-empty audio)
+AUDIO_MIN_CHUNK_SECONDS = 10.0
+# Extracted audio is 16kHz mono signed 16-bit PCM
+AUDIO_SAMPLE_RATE = 16000
+AUDIO_BYTES_PER_SECOND = AUDIO_SAMPLE_RATE * 2
+# How long a HuggingFace model-existence answer is trusted
+HF_EXISTS_TTL = 24 * 60 * 60
+
+def _marian_classes():
+    """Import MarianMT lazily; transformers pulls in torch and dominates import time"""
+    from transformers import MarianMTModel, MarianTokenizer
+    return MarianMTModel, MarianTokenizer
+
+@lru_cache(maxsize=None)
+def _translation_device() -> str:
+    """'cuda' when a GPU is visible to torch, otherwise 'cpu'"""
+    import torch
+    return 'cuda' if torch.cuda.is_available() else 'cpu'
+
+# ASS style fields accepted in the subtitles filter's force_style
+ASS_STYLE_KEYS = frozenset({
+    'FontName', 'FontSize', 'PrimaryColour', 'SecondaryColour', 'OutlineColour', 'BackColour',
+    'Bold', 'Italic', 'Underline', 'StrikeOut', 'ScaleX', 'ScaleY', 'Spacing', 'Angle',
+    'BorderStyle', 'Outline', 'Shadow', 'Alignment', 'MarginL', 'MarginR', 'MarginV',
+    'WrapStyle', 'PlayResX', 'PlayResY', 'LineSpacing', 'MaxLineCount', 'MaximumLineLength'
+})
+
+# Hardware H.264 encoders in order of preference
+HW_VIDEO_ENCODERS = ('h264_nvenc', 'h264_qsv', 'h264_videotoolbox')
+
+@lru_cache(maxsize=None)
+def _available_hw_encoder() -> Optional[str]:
+    """First hardware encoder that can actually encode here; listed encoders may lack a device"""
+    for encoder in HW_VIDEO_ENCODERS:
+        try:
+            result = subprocess.run(
+                ['ffmpeg', '-hide_banner', '-loglevel', 'error',
+                 '-f', 'lavfi', '-i', 'color=size=256x256:duration=0.1',
+                 '-c:v', encoder, '-f', 'null', '-'],
+                capture_output=True,
+                timeout=15
+            )
+        except (OSError, subprocess.TimeoutExpired):
+            continue
+        if result.returncode == 0:
+            logger.info(f"Using hardware video encoder: {encoder}")
+            return encoder
+    logger.info("No hardware video encoder available, using libx264")
+    return None
+
+def _translation_model_bytes(entry: dict) -> int:
+    """Approximate in-memory size of a cached {'model': ..., 'tokenizer': ...} entry"""
+    if 'bytes' in entry:
+        return entry['bytes']
+    models = entry['model'] if isinstance(entry['model'], list) else [entry['model']]
+    total = 0
+    for model in models:
+        for tensor in list(model.parameters()) + list(model.buffers()):
+            total += tensor.numel() * tensor.element_size()
+    return max(total, 1)
+
+def parse_lang_pairs(value: str) -> List[tuple]:
+    """Parse 'en-es,fr-en' into [('en', 'es'), ('fr', 'en')]"""
+    pairs = []
+    for item in (value or '').split(','):
+        source_lang, sep, target_lang = item.strip().partition('-')
+        if sep and source_lang and target_lang:
+            pairs.append((source_lang, target_lang))
+    return pairs
+
+def fork_safe_preload() -> bool:
+    """Whether translation models can be loaded in the gunicorn master and inherited by forked workers.
+
+    Only PyTorch models on the CPU survive fork. A CUDA context can't be
+    re-initialized in a forked child, and CTranslate2/ONNX Runtime thread pools
+    don't exist in the child, so those backends must load inside each worker.
+    """
+    if Config.TRANSLATION_BACKEND in ('ctranslate2', 'onnx'):
+        return False
+    return _translation_device() == 'cpu'
+
+class ChunkTranscriptionError(RuntimeError):
+    """One or more audio chunks could not be transcribed after retries"""
+
 class ProcessingSteps:
     INIT = "Initializing"
     EXTRACT_AUDIO = "Extracting audio"
@@ -32,10 +142,27 @@ class VideoService:
         logger.info("Initializing VideoService")
         self.initialized = False
         self.client: Optional[groq.Client] = None
-        self.translation_models = {}
+        # Weighted LRU so pivot pairs (two models) count double against the budget
+        self.translation_models = LRUCache(
+            maxsize=Config.MODEL_CACHE_MB * 1024 * 1024,
+            getsizeof=_translation_model_bytes
+        )
+        self._translation_models_lock = threading.Lock()
+        self._hf_exists_cache: Optional[Dict[str, list]] = None
+        self._hf_exists_lock = threading.Lock()
+        # Encodes beyond the limit queue here instead of oversubscribing the CPU
+        self._encode_executor = ThreadPoolExecutor(
+            max_workers=Config.MAX_CONCURRENT_ENCODES,
+            thread_name_prefix='vidsub-encode'
+        )
+        self._translation_load_locks = {}
+        self._translation_load_locks_guard = threading.Lock()
         app_dir = os.path.dirname(os.path.dirname(__file__))
         self.upload_folder = os.path.join(app_dir, 'uploads')
         self.output_folder = os.path.join(app_dir, 'uploads', 'output')
+        self._hf_exists_path = os.path.join(self.upload_folder, 'hf_exists.json')
+        # SRT files only live for one ffmpeg run; keep them in RAM when tmpfs is available
+        self.srt_folder = '/dev/shm' if os.access('/dev/shm', os.W_OK) else self.output_folder
         
         os.environ["HF_ENDPOINT"] = "https://hf-mirror.com"
         logger.debug(f"Set HF_ENDPOINT to: {os.environ['HF_ENDPOINT']}")
@@ -44,14 +171,51 @@ class VideoService:
             os.makedirs(folder, exist_ok=True)
             logger.debug(f"Ensured directory exists: {folder}")
             
+        # PID of the process whose warmup thread has been started
+        self._warmup_pid = None
         self.initialized = True
         logger.info("VideoService initialized successfully")
 
+    def start_warmup(self) -> None:
+        """Load the configured common translation models in the background so first requests skip the load.
+
+        Never called from __init__: a service built in the gunicorn master must
+        not have threads running when workers are forked. Starts at most once
+        per process.
+        """
+        if self._warmup_pid == os.getpid():
+            return
+        self._warmup_pid = os.getpid()
+        pairs = parse_lang_pairs(Config.WARMUP_TRANSLATION_PAIRS)
+        if Config.PRELOAD_TRANSLATION_PAIRS and not fork_safe_preload():
+            # The master skipped these (see fork_safe_preload), so each worker loads them
+            pairs = list(dict.fromkeys(parse_lang_pairs(Config.PRELOAD_TRANSLATION_PAIRS) + pairs))
+        if pairs:
+            threading.Thread(
+                target=self.preload_translation_models,
+                args=(pairs,),
+                name='vidsub-warmup',
+                daemon=True
+            ).start()
+
+    def reset_caches(self):
+        """Drop the Groq client, loaded translation models and memoized probe/style/font lookups"""
+        self.client = None
+        with self._translation_models_lock:
+            self.translation_models.clear()
+        with self._hf_exists_lock:
+            # Reloaded from disk on next use
+            self._hf_exists_cache = None
+        clear_probe_cache()
+        get_font_path.cache_clear()
+        self._calculate_subtitle_properties.cache_clear()
+        self._build_style_string.cache_clear()
+
     def ensure_initialized(self):
         """Ensure Groq client is initialized with valid API key"""
         if not self.client:
             logger.info("Initializing Groq client")
-            api_key = os.getenv('GROQ_API_KEY') or current_app.config.get('GROQ_API_KEY')
+            api_key = Config.GROQ_API_KEY
             if not api_key:
                 logger.error("No GROQ_API_KEY found in environment or config")
                 raise ValueError("GROQ_API_KEY not found")
@@ -89,22 +253,20 @@ class VideoService:
             logger.error(f"Error validating video ID: {str(e)}")
             return str(ObjectId())
 
-    def _extract_audio(self, video_path: str) -> str:
-        """Extract audio from video file"""
-        audio_path = os.path.join(self.output_folder, f"{uuid.uuid4()}.wav")
+    def _extract_audio(self, video_path: str) -> bytes:
+        """Extract audio from video file as raw 16kHz mono PCM, kept in memory"""
         logger.info(f"Extracting audio from video: {video_path}")
-        logger.debug(f"Target audio path: {audio_path}")
         
         try:
-            (
+            # Video and subtitle streams are dropped, so only the audio track is decoded
+            pcm, _ = (
                 ffmpeg
                 .input(video_path)
-                .output(audio_path, ac=1, ar=16000)
-                .overwrite_output()
+                .output('pipe:1', format='s16le', acodec='pcm_s16le', ac=1, ar=AUDIO_SAMPLE_RATE, vn=None, sn=None)
                 .run(capture_stdout=True, capture_stderr=True)
             )
-            logger.info("Audio extraction completed successfully")
-            return audio_path
+            logger.info(f"Audio extraction completed successfully ({len(pcm)} bytes)")
+            return pcm
         except ffmpeg.Error as e:
             error_message = f"FFmpeg error: {e.stderr.decode('utf-8') if e.stderr else 'Unknown error'}"
             logger.error(error_message)
@@ -114,21 +276,137 @@ class VideoService:
             raise
 
     def _model_exists_on_hf(self, model_name: str) -> bool:
-        """Check if a model exists on HuggingFace hub"""
+        """Check if a model exists on HuggingFace hub, using the local snapshot or a cached answer when possible"""
+        from huggingface_hub import HfApi, try_to_load_from_cache
+        from huggingface_hub.utils import RepositoryNotFoundError
+
+        if isinstance(try_to_load_from_cache(model_name, 'config.json'), str):
+            logger.debug(f"Model {model_name} found in local HuggingFace cache")
+            return True
+
+        with self._hf_exists_lock:
+            cached = self._load_hf_exists_cache().get(model_name)
+        if cached and time.time() - cached[1] < HF_EXISTS_TTL:
+            logger.debug(f"Model {model_name} {'exists' if cached[0] else 'not found'} (cached)")
+            return cached[0]
+
         try:
             logger.debug(f"Checking HuggingFace for model: {model_name}")
-            api_url = f"https://huggingface.co/api/models/{model_name}"
-            response = requests.get(api_url, timeout=10)
-            exists = response.status_code == 200
-            logger.info(f"Model {model_name} {'exists' if exists else 'not found'} on HuggingFace")
-            return exists
-        except requests.exceptions.Timeout:
-            logger.warning(f"HuggingFace API timeout for model: {model_name}")
-            return False
+            # HfApi honors HF_ENDPOINT, so the probe goes through the configured mirror
+            HfApi().model_info(model_name, timeout=10)
+            exists = True
+        except RepositoryNotFoundError:
+            exists = False
         except Exception as e:
-            logger.error(f"Error checking HuggingFace model: {str(e)}")
+            # Timeouts and outages are not cached so the next request retries
+            logger.warning(f"Error checking HuggingFace model {model_name}: {str(e)}")
             return False
 
+        logger.info(f"Model {model_name} {'exists' if exists else 'not found'} on HuggingFace")
+        with self._hf_exists_lock:
+            self._load_hf_exists_cache()[model_name] = [exists, time.time()]
+            self._save_hf_exists_cache()
+        return exists
+
+    def _load_hf_exists_cache(self) -> Dict[str, list]:
+        if self._hf_exists_cache is None:
+            try:
+                with open(self._hf_exists_path) as f:
+                    self._hf_exists_cache = json.load(f)
+            except (OSError, ValueError):
+                self._hf_exists_cache = {}
+        return self._hf_exists_cache
+
+    def _save_hf_exists_cache(self) -> None:
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.upload_folder, suffix='.json')
+            with os.fdopen(fd, 'w') as f:
+                json.dump(self._hf_exists_cache, f)
+            os.replace(tmp_path, self._hf_exists_path)
+        except OSError as e:
+            logger.warning(f"Failed to persist HuggingFace model cache: {str(e)}")
+
+    def _prepare_translation_model(self, model):
+        """Apply configured inference optimizations to a freshly loaded MarianMT model"""
+        model.eval()
+        if _translation_device() == 'cuda':
+            logger.info("Moving translation model to CUDA in fp16")
+            return model.to('cuda').half()
+        # Dynamic quantization only has CPU kernels
+        if Config.TRANSLATION_QUANTIZATION == 'int8':
+            import torch
+            logger.info("Applying dynamic int8 quantization to translation model")
+            model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        return model
+
+    def _load_marian_model(self, model_name: str, local_files_only: bool = False) -> tuple:
+        """Load one MarianMT model with the configured backend, returning (model, tokenizer, bytes or None)"""
+        MarianMTModel, MarianTokenizer = _marian_classes()
+        # Raises OSError before any conversion when local_files_only and the snapshot is missing
+        tokenizer = MarianTokenizer.from_pretrained(model_name, local_files_only=local_files_only)
+        if Config.TRANSLATION_BACKEND == 'ctranslate2':
+            translator, size = self._load_ct2_translator(model_name)
+            return translator, tokenizer, size
+        if Config.TRANSLATION_BACKEND == 'onnx':
+            model, size = self._load_onnx_model(model_name)
+            return model, tokenizer, size
+        model = MarianMTModel.from_pretrained(model_name, local_files_only=local_files_only)
+        return self._prepare_translation_model(model), tokenizer, None
+
+    def _load_ct2_translator(self, model_name: str) -> tuple:
+        """Load an int8 CTranslate2 translator, converting the HF model on first use"""
+        import ctranslate2
+
+        def convert(output_dir):
+            logger.info(f"Converting {model_name} to CTranslate2 int8")
+            ctranslate2.converters.TransformersConverter(model_name).convert(output_dir, quantization='int8', force=True)
+
+        ct2_dir, size = self._converted_model_dir(Config.CT2_MODEL_DIR, model_name, '-ct2-int8', convert)
+        on_gpu = ctranslate2.get_cuda_device_count() > 0
+        translator = ctranslate2.Translator(
+            ct2_dir,
+            device='cuda' if on_gpu else 'cpu',
+            compute_type='int8_float16' if on_gpu else 'int8',
+            inter_threads=1,
+            intra_threads=os.cpu_count() or 0
+        )
+        return translator, size
+
+    def _load_onnx_model(self, model_name: str) -> tuple:
+        """Load an ONNX Runtime seq2seq model with full graph optimization, exporting it on first use"""
+        import onnxruntime
+        from optimum.onnxruntime import ORTModelForSeq2SeqLM
+
+        def export(output_dir):
+            logger.info(f"Exporting {model_name} to ONNX")
+            ORTModelForSeq2SeqLM.from_pretrained(model_name, export=True).save_pretrained(output_dir)
+
+        onnx_dir, size = self._converted_model_dir(Config.ONNX_MODEL_DIR, model_name, '-onnx', export)
+        session_options = onnxruntime.SessionOptions()
+        session_options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        model = ORTModelForSeq2SeqLM.from_pretrained(
+            onnx_dir,
+            provider='CPUExecutionProvider',
+            session_options=session_options
+        )
+        return model, size
+
+    @staticmethod
+    def _converted_model_dir(root: str, model_name: str, suffix: str, convert: Callable) -> tuple:
+        """Return (path, bytes on disk) of a converted model, running convert(path) if it is missing"""
+        model_dir = os.path.join(root, model_name.replace('/', '--') + suffix)
+        if not os.path.isdir(model_dir):
+            # Convert into a private directory so concurrent workers never see a partial model
+            tmp_dir = f"{model_dir}.tmp{os.getpid()}"
+            convert(tmp_dir)
+            try:
+                os.rename(tmp_dir, model_dir)
+            except OSError:
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+
+        size = sum(entry.stat().st_size for entry in os.scandir(model_dir) if entry.is_file())
+        return model_dir, size
+
     def get_translation_model(self, source_lang: str, target_lang: str):
         """Get appropriate translation model for language pair with fallbacks"""
         source_lang = normalize_lang_code(source_lang)
@@ -146,34 +424,87 @@ class VideoService:
             f'Helsinki-NLP/opus-mt-{source_lang}-{target_lang}-big',
         ]
 
+        pivot_key = f'{source_lang}-{target_lang}_pivot'
+
         # Check cached models first
-        for model_name in model_variants:
-            if model_name in self.translation_models:
-                logger.info(f"Using cached translation model: {model_name}")
-                return self.translation_models[model_name]
+        cached = self._find_cached_translation_model(model_variants + [pivot_key])
+        if cached:
+            return cached
+
+        # Concurrent jobs for the same pair wait for a single load instead of each loading it
+        with self._translation_load_lock(f'{source_lang}-{target_lang}'):
+            cached = self._find_cached_translation_model(model_variants + [pivot_key])
+            if cached:
+                return cached
+            return self._load_translation_model(source_lang, target_lang, model_variants, pivot_key)
+
+    def _find_cached_translation_model(self, keys: List[str]):
+        with self._translation_models_lock:
+            for key in keys:
+                cached = self.translation_models.get(key)
+                if cached is not None:
+                    logger.info(f"Using cached translation model: {key}")
+                    return cached
+        return None
 
-        # Try direct translation models
-        logger.info("Attempting to load direct translation models")
-        for model_name in model_variants:
+    def _cache_translation_model(self, key: str, entry: dict) -> dict:
+        """Add a loaded model to the LRU, evicting the coldest ones past the memory budget"""
+        with self._translation_models_lock:
             try:
-                if self._model_exists_on_hf(model_name):
-                    logger.info(f"Loading direct translation model: {model_name}")
-                    self.translation_models[model_name] = {
-                        'model': MarianMTModel.from_pretrained(model_name),
-                        'tokenizer': MarianTokenizer.from_pretrained(model_name)
-                    }
-                    return self.translation_models[model_name]
-            except Exception as e:
-                logger.warning(f"Failed to load direct model {model_name}: {str(e)}")
-                continue
+                self.translation_models[key] = entry
+            except ValueError:
+                logger.warning(f"Translation model {key} exceeds the model cache budget; not caching it")
+            logger.debug(f"Translation model cache: {self.translation_models.currsize / 2**20:.0f}MB "
+                         f"of {self.translation_models.maxsize / 2**20:.0f}MB")
+        return entry
+
+    def _translation_load_lock(self, pair: str) -> threading.Lock:
+        with self._translation_load_locks_guard:
+            return self._translation_load_locks.setdefault(pair, threading.Lock())
+
+    def _load_translation_model(self, source_lang: str, target_lang: str, model_variants: List[str], pivot_key: str):
+        """Load a direct or pivot translation model and add it to the cache"""
+        # Locally cached snapshots load without any network round trip
+        for local_files_only in (True, False):
+            logger.info(f"Attempting to load {'locally cached' if local_files_only else 'remote'} direct translation models")
+            entry = self._load_direct_model(model_variants, local_files_only)
+            if entry:
+                return entry
 
         # Try pivot translation via English
         if source_lang != 'en':
+            pivot_models = [f'Helsinki-NLP/opus-mt-{source_lang}-en', f'Helsinki-NLP/opus-mt-en-{target_lang}']
+            logger.info("Attempting pivot translation via English")
+            for local_files_only in (True, False):
+                entry = self._load_pivot_model(pivot_models, pivot_key, local_files_only)
+                if entry:
+                    return entry
+
+        logger.warning("No suitable translation models found")
+        return None
+
+    def _load_direct_model(self, model_variants: List[str], local_files_only: bool):
+        for model_name in model_variants:
             try:
-                logger.info("Attempting pivot translation via English")
-                source_to_en = f'Helsinki-NLP/opus-mt-{source_lang}-en'
-                en_to_target = f'Helsinki-NLP/opus-mt-en-{target_lang}'
+                if not local_files_only and not self._model_exists_on_hf(model_name):
+                    continue
+                model, tokenizer, size = self._load_marian_model(model_name, local_files_only)
+                logger.info(f"Loaded direct translation model: {model_name}")
+                entry = {'model': model, 'tokenizer': tokenizer}
+                if size is not None:
+                    entry['bytes'] = size
+                return self._cache_translation_model(model_name, entry)
+            except OSError as e:
+                if not local_files_only:
+                    logger.warning(f"Failed to load direct model {model_name}: {str(e)}")
+            except Exception as e:
+                logger.warning(f"Failed to load direct model {model_name}: {str(e)}")
+        return None
 
+    def _load_pivot_model(self, pivot_models: List[str], pivot_key: str, local_files_only: bool):
+        source_to_en, en_to_target = pivot_models
+        try:
+            if not local_files_only:
                 if not self._model_exists_on_hf(source_to_en):
                     logger.warning(f"Source pivot model not found: {source_to_en}")
                     return None
@@ -181,277 +512,442 @@ class VideoService:
                     logger.warning(f"Target pivot model not found: {en_to_target}")
                     return None
 
-                logger.info("Loading pivot translation models")
-                self.translation_models[f'{source_lang}-{target_lang}_pivot'] = {
-                    'model': [
-                        MarianMTModel.from_pretrained(source_to_en),
-                        MarianMTModel.from_pretrained(en_to_target)
-                    ],
-                    'tokenizer': [
-                        MarianTokenizer.from_pretrained(source_to_en),
-                        MarianTokenizer.from_pretrained(en_to_target)
-                    ]
-                }
-                return self.translation_models[f'{source_lang}-{target_lang}_pivot']
-            except Exception as e:
+            model1, tokenizer1, size1 = self._load_marian_model(source_to_en, local_files_only)
+            model2, tokenizer2, size2 = self._load_marian_model(en_to_target, local_files_only)
+            logger.info(f"Loaded pivot translation models: {source_to_en}, {en_to_target}")
+            entry = {'model': [model1, model2], 'tokenizer': [tokenizer1, tokenizer2]}
+            if size1 is not None and size2 is not None:
+                entry['bytes'] = size1 + size2
+            return self._cache_translation_model(pivot_key, entry)
+        except OSError as e:
+            if not local_files_only:
                 logger.error(f"Pivot translation setup failed: {str(e)}")
-
-        logger.warning("No suitable translation models found")
+        except Exception as e:
+            logger.error(f"Pivot translation setup failed: {str(e)}")
         return None
 
-    def _translate_with_groq_fallback(self, text: str, source_lang: str, target_lang: str) -> str:
-        """Translate text using Groq LLM as fallback"""
-        self.ensure_initialized()
-        try:
-            logger.info(f"Using Groq LLM for translation: {source_lang} -> {target_lang}")
-            logger.debug(f"Text to translate: {text[:100]}...")
-
-            # Enhanced prompt for Arabic translation
-            if source_lang == 'ar':
-                system_prompt = (
-                    "You are an expert Arabic translator. Translate the following text to English, "
-                    "maintaining proper context and nuance. Preserve any technical terms, names, "
-                    "and numbers exactly as they appear. Provide a natural, fluent translation "
-                    "that captures the original meaning accurately."
-                )
-            else:
-                system_prompt = (
-                    f"Translate the following text from {source_lang} to {target_lang}. "
-                    "Maintain exact meaning, preserve numbers and proper nouns."
-                )
+    def preload_translation_models(self, pairs: List[tuple]) -> None:
+        """Load translation models for the given (source, target) pairs ahead of first use"""
+        for source_lang, target_lang in pairs:
+            try:
+                logger.info(f"Preloading translation model: {source_lang} -> {target_lang}")
+                self.get_translation_model(source_lang, target_lang)
+            except Exception as e:
+                logger.warning(f"Failed to preload {source_lang} -> {target_lang}: {str(e)}")
+
+    def _groq_translation_messages(self, text: str, source_lang: str, target_lang: str) -> list:
+        # Enhanced prompt for Arabic translation
+        if source_lang == 'ar':
+            system_prompt = (
+                "You are an expert Arabic translator. Translate the following text to English, "
+                "maintaining proper context and nuance. Preserve any technical terms, names, "
+                "and numbers exactly as they appear. Provide a natural, fluent translation "
+                "that captures the original meaning accurately."
+            )
+        else:
+            system_prompt = (
+                f"Translate the following text from {source_lang} to {target_lang}. "
+                "Maintain exact meaning, preserve numbers and proper nouns."
+            )
 
-            response = self.client.chat.completions.create(
-                messages=[
-                    {
-                        "role": "system",
-                        "content": system_prompt
-                    },
-                    {
-                        "role": "user",
-                        "content": text
-                    }
-                ],
+        return [
+            {
+                "role": "system",
+                "content": system_prompt
+            },
+            {
+                "role": "user",
+                "content": text
+            }
+        ]
+
+    async def _translate_with_groq_async(self, client, semaphore, text: str, source_lang: str, target_lang: str) -> str:
+        """Translate text using Groq LLM, bounded by a semaphore shared across the job"""
+        async with semaphore:
+            response = await client.chat.completions.create(
+                messages=self._groq_translation_messages(text, source_lang, target_lang),
                 model="mixtral-8x7b-32768",
                 temperature=0.1,
                 max_tokens=1000
             )
+        return response.choices[0].message.content.strip()
 
-            translated = response.choices[0].message.content.strip()
-            logger.info("Groq translation completed successfully")
-            logger.debug(f"Translated text: {translated[:100]}...")
-            return translated
+    def _translate_many_with_groq(self, texts: List[str], source_lang: str, target_lang: str) -> List[str]:
+        """Translate texts through Groq with up to GROQ_MAX_CONCURRENCY requests in flight"""
+        self.ensure_initialized()
+        logger.info(f"Using Groq LLM for {len(texts)} translations: {source_lang} -> {target_lang}")
+
+        async def translate_all():
+            semaphore = asyncio.Semaphore(GROQ_MAX_CONCURRENCY)
+            # httpx connection pools are bound to the event loop, so use one client per run
+            async with groq.AsyncClient(api_key=self.client.api_key) as client:
+                return await asyncio.gather(
+                    *(self._translate_with_groq_async(client, semaphore, text, source_lang, target_lang)
+                      for text in texts),
+                    return_exceptions=True
+                )
 
-        except Exception as e:
-            logger.error(f"Groq translation failed: {str(e)}")
-            logger.error(f"Original text: {text[:100]}...")
-            return text
+        results = asyncio.run(translate_all())
+
+        translated = []
+        for text, result in zip(texts, results):
+            if isinstance(result, Exception):
+                logger.error(f"Groq translation failed: {str(result)}")
+                logger.error(f"Original text: {text[:100]}...")
+                translated.append(text)
+            else:
+                translated.append(result)
+        return translated
 
     def translate_text(self, text: str, source_lang: str, target_lang: str) -> str:
         """Translate text between languages with enhanced Arabic support"""
+        return self.translate_batch([text], source_lang, target_lang)[0]
+
+    def translate_batch(self, texts: List[str], source_lang: str, target_lang: str) -> List[str]:
+        """Translate a list of texts, running MarianMT over whole batches at once"""
         source_lang = normalize_lang_code(source_lang)
         target_lang = normalize_lang_code(target_lang)
         
-        logger.info(f"Translating text from {source_lang} to {target_lang}")
-        logger.debug(f"Input text: {text[:100]}...")
+        logger.info(f"Translating {len(texts)} texts from {source_lang} to {target_lang}")
         
+        if not texts:
+            return []
+
         if source_lang == target_lang:
             logger.debug("Skipping translation (same language)")
-            return text
+            return list(texts)
 
         # For Arabic to English, prefer Groq directly
         if source_lang == 'ar' and target_lang == 'en':
             logger.info("Arabic to English detected, using Groq directly")
-            return self._translate_with_groq_fallback(text, source_lang, target_lang)
+            return self._translate_many_with_groq(texts, source_lang, target_lang)
 
         model_info = self.get_translation_model(source_lang, target_lang)
         if not model_info:
             logger.warning("No translation model available, using Groq fallback")
-            return self._translate_with_groq_fallback(text, source_lang, target_lang)
+            return self._translate_many_with_groq(texts, source_lang, target_lang)
 
         try:
-            logger.debug(f"Using translation model: {model_info['tokenizer'].name_or_path}")
             if isinstance(model_info['model'], list):
                 # Pivot translation via English
                 tokenizer1, tokenizer2 = model_info['tokenizer']
                 model1, model2 = model_info['model']
                 
                 logger.debug("Performing pivot translation via English")
-                
-                # First translation to English
-                inputs = tokenizer1([text], return_tensors="pt", 
-                                  padding=True, truncation=True, max_length=512)
-                translated = model1.generate(**inputs)
-                pivot_text = tokenizer1.decode(translated[0], skip_special_tokens=True)
-                logger.debug(f"Pivot text (English): {pivot_text[:100]}...")
-                
-                # Then to target language
-                inputs = tokenizer2([pivot_text], return_tensors="pt", 
-                                 padding=True, truncation=True, max_length=512)
-                translated = model2.generate(**inputs)
-                final_text = tokenizer2.decode(translated[0], skip_special_tokens=True)
-                logger.debug(f"Final translated text: {final_text[:100]}...")
-                return final_text
+                pivot_texts = self._marian_translate_batch(model1, tokenizer1, texts)
+                return self._marian_translate_batch(model2, tokenizer2, pivot_texts)
             else:
-                # Direct translation
-                logger.debug("Performing direct translation")
-                tokenizer = model_info['tokenizer']
-                model = model_info['model']
-                inputs = tokenizer([text], return_tensors="pt", 
-                                 padding=True, truncation=True, max_length=512)
-                translated = model.generate(**inputs)
-                final_text = tokenizer.decode(translated[0], skip_special_tokens=True)
-                logger.debug(f"Translated text: {final_text[:100]}...")
-                return final_text
+                logger.debug(f"Performing direct translation with: {model_info['tokenizer'].name_or_path}")
+                return self._marian_translate_batch(model_info['model'], model_info['tokenizer'], texts)
         except Exception as e:
             logger.error(f"Translation error: {str(e)}")
             logger.warning("Falling back to Groq translation")
-            return self._translate_with_groq_fallback(text, source_lang, target_lang)
+            return self._translate_many_with_groq(texts, source_lang, target_lang)
+
+    def _marian_translate_batch(self, model, tokenizer, texts: List[str]) -> List[str]:
+        """Run MarianMT over texts in length-sorted batches to keep padding small"""
+        if not hasattr(model, 'generate'):
+            return self._ct2_translate_batch(model, tokenizer, texts)
+
+        import torch
+
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        results = [None] * len(texts)
+
+        for start in range(0, len(order), TRANSLATION_BATCH_SIZE):
+            batch = order[start:start + TRANSLATION_BATCH_SIZE]
+            inputs = tokenizer([texts[i] for i in batch], return_tensors="pt",
+                             padding=True, truncation=True, max_length=512).to(model.device)
+            with torch.inference_mode():
+                translated = self._marian_generate(model, inputs, quality=Config.TRANSLATION_QUALITY)
+            decoded = tokenizer.batch_decode(translated, skip_special_tokens=True)
+            for i, text in zip(batch, decoded):
+                results[i] = text
+
+        logger.debug(f"Translated {len(texts)} texts in {-(-len(texts) // TRANSLATION_BATCH_SIZE)} batches")
+        return results
+
+    def _marian_generate(self, model, inputs, quality: bool = False):
+        """Greedy decoding with the KV cache by default; beam search only when quality is requested"""
+        max_new_tokens = min(512, int(inputs['input_ids'].shape[1] * 1.5) + 16)
+        if quality:
+            return model.generate(**inputs, num_beams=4, early_stopping=True, use_cache=True,
+                                  max_new_tokens=max_new_tokens)
+        return model.generate(**inputs, num_beams=1, do_sample=False, use_cache=True,
+                              max_new_tokens=max_new_tokens)
+
+    def _ct2_translate_batch(self, translator, tokenizer, texts: List[str]) -> List[str]:
+        """Translate with a CTranslate2 translator; it sorts and batches by length itself"""
+        source = [tokenizer.convert_ids_to_tokens(tokenizer.encode(text)) for text in texts]
+        results = translator.translate_batch(
+            source,
+            max_batch_size=TRANSLATION_BATCH_SIZE,
+            beam_size=4 if Config.TRANSLATION_QUALITY else 1,
+            max_decoding_length=512
+        )
+        return [
+            tokenizer.decode(tokenizer.convert_tokens_to_ids(result.hypotheses[0]), skip_special_tokens=True)
+            for result in results
+        ]
 
-    def detect_language(self, audio_path: str) -> str:
-        """Detect language of audio content using Whisper"""
-        try:
-            logger.info("Starting language detection with Whisper")
-            with open(audio_path, "rb") as audio_file:
-                response = self.client.audio.transcriptions.create(
-                    file=audio_file,
+    @staticmethod
+    def _wav_file(pcm: bytes, name: str = "audio.wav") -> tuple:
+        """Wrap raw PCM in a WAV header as a (filename, bytes) upload tuple"""
+        buffer = io.BytesIO()
+        with wave.open(buffer, 'wb') as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(AUDIO_SAMPLE_RATE)
+            wav.writeframes(pcm)
+        return name, buffer.getvalue()
+
+    def _split_audio(self, pcm: bytes) -> List[tuple]:
+        """Split PCM audio into overlapping WAV chunks, returning [(offset_seconds, upload)]"""
+        duration = len(pcm) / AUDIO_BYTES_PER_SECOND
+        min_tail = max(AUDIO_MIN_CHUNK_SECONDS, AUDIO_CHUNK_OVERLAP)
+        if duration <= AUDIO_CHUNK_SECONDS + min_tail:
+            return [(0.0, self._wav_file(pcm))]
+
+        logger.info(f"Splitting {duration:.1f}s of audio into {AUDIO_CHUNK_SECONDS}s chunks")
+        chunk_bytes = AUDIO_CHUNK_SECONDS * AUDIO_BYTES_PER_SECOND
+        overlap_bytes = int(AUDIO_CHUNK_OVERLAP * AUDIO_SAMPLE_RATE) * 2
+        starts = list(range(0, len(pcm), chunk_bytes))
+        # The previous window would already cover most or all of a short tail;
+        # let that window run to the end of the audio instead
+        if len(pcm) - starts[-1] < min_tail * AUDIO_BYTES_PER_SECOND:
+            starts.pop()
+
+        chunks = []
+        for idx, start in enumerate(starts):
+            end = starts[idx + 1] + overlap_bytes if idx + 1 < len(starts) else len(pcm)
+            chunks.append((start / AUDIO_BYTES_PER_SECOND, self._wav_file(pcm[start:end], f"audio_{idx}.wav")))
+        return chunks
+
+    async def _transcribe_chunk_async(self, client, semaphore, audio: tuple, source_lang: str, target_lang: str) -> dict:
+        """Transcribe (or translate to English) one audio chunk with Whisper.
+
+        The returned response's 'language' is the spoken language and
+        'text_language' the language its segment text is in.
+        """
+        async with semaphore:
+            response = None
+            source = normalize_lang_code(source_lang) if source_lang else None
+            # Known non-English source going to English: translate in one call
+            if target_lang == 'en' and source and source != 'en':
+                response = await self._whisper_translate(client, audio)
+                if response is not None:
+                    response['language'] = source
+            if response is None:
+                # Without a source language Whisper auto-detects it
+                kwargs = {'language': source_lang} if source_lang else {}
+                response = self._as_dict(await client.audio.transcriptions.create(
+                    file=audio,
                     model="whisper-large-v3",
-                    response_format="verbose_json"
-                )
-                
-                if not isinstance(response, dict):
-                    response = response.model_dump()
-                
-                detected_lang = response.get('language', 'en')
-                normalized_lang = normalize_lang_code(detected_lang)
-                logger.info(f"Whisper detected language code: {detected_lang}, normalized to: {normalized_lang}")
-                return normalized_lang
+                    response_format="verbose_json",
+                    **kwargs
+                ))
+                response['text_language'] = normalize_lang_code(response.get('language') or source_lang or 'en')
+                # Auto-detected non-English speech going to English: translate now that the language is known
+                if target_lang == 'en' and source is None and response['text_language'] != 'en':
+                    translated = await self._whisper_translate(client, audio)
+                    if translated is not None:
+                        translated['language'] = response.get('language')
+                        response = translated
+        return response
+
+    async def _whisper_translate(self, client, audio: tuple) -> Optional[dict]:
+        """Whisper's speech-to-English translation; None if the call fails"""
+        try:
+            response = self._as_dict(await client.audio.translations.create(
+                file=audio,
+                model="whisper-large-v3",
+                response_format="verbose_json"
+            ))
         except Exception as e:
-            logger.error(f"Language detection error: {str(e)}, defaulting to 'en'")
-            return 'en'
+            logger.warning(f"Translations API failed: {str(e)}, falling back to transcription")
+            return None
+        response['text_language'] = 'en'
+        return response
+
+    @staticmethod
+    def _as_dict(response) -> dict:
+        return response if isinstance(response, dict) else response.model_dump()
 
-    def _transcribe_with_groq(self, audio_path: str, source_lang: str, target_lang: str) -> dict:
-        """Transcribe audio using Groq's Whisper model"""
+    async def _transcribe_chunks(self, chunks: List[tuple], source_lang: str, target_lang: str,
+                                 on_chunk: Optional[Callable] = None) -> list:
+        semaphore = asyncio.Semaphore(GROQ_MAX_CONCURRENCY)
+
+        async def transcribe(client, idx, audio):
+            for attempt in range(GROQ_CHUNK_RETRIES + 1):
+                try:
+                    response = await self._transcribe_chunk_async(client, semaphore, audio, source_lang, target_lang)
+                    break
+                except GROQ_RETRYABLE_ERRORS as e:
+                    if attempt == GROQ_CHUNK_RETRIES:
+                        raise
+                    delay = GROQ_RETRY_BACKOFF * 2 ** attempt
+                    logger.warning(f"Audio chunk {idx} failed ({str(e)}), retrying in {delay:.0f}s")
+                    await asyncio.sleep(delay)
+            segments = self._chunk_segments(chunks, idx, response)
+            if on_chunk:
+                on_chunk(idx, response['text_language'], segments)
+            return response, segments
+
+        # Retries are handled per chunk above
+        async with groq.AsyncClient(api_key=self.client.api_key, max_retries=0) as client:
+            # Let every chunk finish so one failure doesn't cancel (and waste) the others
+            results = await asyncio.gather(
+                *(transcribe(client, idx, audio) for idx, (_, audio) in enumerate(chunks)),
+                return_exceptions=True
+            )
+
+        failed = [(idx, result) for idx, result in enumerate(results) if isinstance(result, BaseException)]
+        if failed:
+            details = '; '.join(
+                f"chunk {idx} at {chunks[idx][0]:.0f}s: {str(error)}" for idx, error in failed
+            )
+            raise ChunkTranscriptionError(
+                f"Transcription failed for {len(failed)} of {len(chunks)} audio chunk(s): {details}"
+            ) from failed[0][1]
+        return results
+
+    def _chunk_segments(self, chunks: List[tuple], idx: int, response: dict) -> list:
+        """Validate one chunk's segments, shifting timestamps and cutting each overlap at its midpoint"""
+        offset = chunks[idx][0]
+        window_start = offset + AUDIO_CHUNK_OVERLAP / 2 if idx > 0 else float('-inf')
+        window_end = chunks[idx + 1][0] + AUDIO_CHUNK_OVERLAP / 2 if idx + 1 < len(chunks) else float('inf')
+
+        processed_segments = []
+        for seg_idx, segment in enumerate(response.get('segments', []), 1):
+            try:
+                if all(key in segment for key in ['start', 'end', 'text']):
+                    start = float(segment['start']) + offset
+                    end = float(segment['end']) + offset
+                    if end > start and segment['text'].strip():
+                        if window_start <= start < window_end:
+                            processed_segments.append({
+                                'start': start,
+                                'end': end,
+                                'text': segment['text'].strip()
+                            })
+                    else:
+                        logger.warning(f"Invalid segment timing or empty text in chunk {idx} segment {seg_idx}")
+                else:
+                    logger.warning(f"Missing required keys in chunk {idx} segment {seg_idx}")
+            except Exception as e:
+                logger.error(f"Error processing chunk {idx} segment {seg_idx}: {str(e)}")
+        return processed_segments
+
+    def _transcribe_with_groq(self, pcm: bytes, source_lang: Optional[str], target_lang: str,
+                              on_chunk: Optional[Callable] = None) -> dict:
+        """Transcribe audio using Groq's Whisper model, chunking long audio into parallel requests.
+
+        The detected language comes from the same call; pass source_lang=None to let Whisper detect it.
+        'detected_language' is the spoken language and 'text_language' the language of the
+        segment text, which is English when Whisper already translated it.
+        on_chunk(idx, text_language, segments) is called as each chunk finishes, before the others are done.
+        """
         try:
             logger.info(f"Starting transcription (source={source_lang}, target={target_lang})")
-            logger.info(f"Audio file: {audio_path}")
 
-            with open(audio_path, "rb") as audio_file:
-                # Try translations API first if target is English
-                if target_lang == 'en' and source_lang != 'en':
-                    try:
-                        logger.info("Attempting direct English translation with Whisper translations API")
-                        response = self.client.audio.translations.create(
-                            file=audio_file,
-                            model="whisper-large-v3",
-                            response_format="verbose_json"
-                        )
-                        logger.info("Translation API call successful")
-                    except Exception as e:
-                        logger.warning(f"Translations API failed: {str(e)}, falling back to transcription")
-                        response = self.client.audio.transcriptions.create(
-                            file=audio_file,
-                            model="whisper-large-v3",
-                            response_format="verbose_json",
-                            language=source_lang
-                        )
-                else:
-                    logger.info(f"Using transcription API with language={source_lang}")
-                    response = self.client.audio.transcriptions.create(
-                        file=audio_file,
-                        model="whisper-large-v3",
-                        response_format="verbose_json",
-                        language=source_lang
-                    )
-
-            if not isinstance(response, dict):
-                response = response.model_dump()
-                logger.debug("Converted response to dictionary format")
+            chunks = self._split_audio(pcm)
+            results = self._run_transcription(chunks, source_lang, target_lang, on_chunk)
+            chunk_segments = [segments for _, segments in results]
 
             # Extract and validate detected language
-            detected_language = response.get('language', source_lang)
+            detected_language = results[0][0].get('language') or source_lang or 'en'
             normalized_detected = normalize_lang_code(detected_language)
             logger.info(f"Whisper detected language: {detected_language} (normalized: {normalized_detected})")
+            text_language = results[0][0]['text_language']
+
+            # Drop segments repeated on both sides of a chunk boundary
+            processed_segments = []
+            seen = set()
+            for segment in itertools.chain.from_iterable(chunk_segments):
+                key = (round(segment['start'], 1), segment['text'][:40])
+                if key not in seen:
+                    seen.add(key)
+                    processed_segments.append(segment)
+            processed_segments.sort(key=lambda s: s['start'])
 
             # Get sample text for verification
-            segments = response.get('segments', [])
-            if segments:
-                sample_text = segments[0].get('text', '')
+            if processed_segments:
+                sample_text = processed_segments[0]['text']
                 logger.info(f"Sample text from first segment: {sample_text[:100]}")
             else:
                 logger.warning("No segments found in transcription response")
                 sample_text = ''
 
-            # Process and validate segments
-            processed_segments = []
-            for idx, segment in enumerate(segments, 1):
-                try:
-                    if all(key in segment for key in ['start', 'end', 'text']):
-                        if segment['end'] > segment['start'] and segment['text'].strip():
-                            processed_segments.append({
-                                'start': float(segment['start']),
-                                'end': float(segment['end']),
-                                'text': segment['text'].strip()
-                            })
-                        else:
-                            logger.warning(f"Invalid segment timing or empty text in segment {idx}")
-                    else:
-                        logger.warning(f"Missing required keys in segment {idx}")
-                except Exception as e:
-                    logger.error(f"Error processing segment {idx}: {str(e)}")
-
             logger.info(f"Successfully processed {len(processed_segments)} segments")
             return {
                 'segments': processed_segments,
+                'chunk_segments': chunk_segments,
                 'detected_language': normalized_detected,
+                'text_language': text_language,
                 'sample_text': sample_text
             }
 
+        except ChunkTranscriptionError as e:
+            logger.error(str(e))
+            raise
         except Exception as e:
             logger.error(f"Transcription failed: {str(e)}")
             return {
                 'segments': [],
+                'chunk_segments': [],
                 'detected_language': source_lang,
+                'text_language': source_lang,
                 'sample_text': ''
             }
 
+    def _run_transcription(self, chunks: List[tuple], source_lang: str, target_lang: str,
+                           on_chunk: Optional[Callable] = None) -> list:
+        logger.info(f"Transcribing {len(chunks)} audio chunk(s)")
+        return asyncio.run(self._transcribe_chunks(chunks, source_lang, target_lang, on_chunk))
+
+    def _collect_translations(self, transcription: dict, pending: dict, source_lang: str, target_lang: str) -> list:
+        """Gather chunk translations started during transcription, translating whatever is left in one batch"""
+        translated = {}
+        missing = []
+        for idx, chunk_segments in enumerate(transcription['chunk_segments']):
+            language, future = pending.get(idx, (None, None))
+            # A chunk translated from a different detected language is redone
+            if future is not None and language == source_lang:
+                translated.update(zip(map(id, chunk_segments), future.result()))
+            else:
+                missing.extend(chunk_segments)
+        if missing:
+            translated.update(zip(map(id, missing), self._process_subtitles(missing, source_lang, target_lang)))
+        return [translated[id(segment)] for segment in transcription['segments']]
+
     def _process_subtitles(self, subtitles: list, source_lang: str, target_lang: str) -> list:
         """Process and translate subtitles with enhanced logging"""
         logger.info(f"Processing {len(subtitles)} subtitle segments")
         logger.info(f"Translation direction: {source_lang} -> {target_lang}")
         
-        processed = []
-        total_segments = len(subtitles)
-        translation_errors = 0
-        
-        for idx, sub in enumerate(subtitles, 1):
-            try:
-                translated_text = self.translate_text(sub['text'], source_lang, target_lang)
-                processed.append({
-                    'start': sub['start'],
-                    'end': sub['end'],
-                    'text': translated_text
-                })
-                
-                # Detailed logging every few segments
-                if idx % 5 == 0:
-                    logger.info(f"Progress: {idx}/{total_segments} segments translated")
-                    logger.debug(f"Sample translation {idx}:")
-                    logger.debug(f"Original: {sub['text']}")
-                    logger.debug(f"Translated: {translated_text}")
-                
-            except Exception as e:
-                translation_errors += 1
-                logger.error(f"Failed to translate segment {idx}: {str(e)}")
-                logger.error(f"Problematic text: {sub['text']}")
-                # Keep original if translation fails
-                processed.append(sub)
-                
-                if translation_errors >= 5:
-                    logger.critical(f"High translation failure rate: {translation_errors} failures")
+        texts = [sub['text'] for sub in subtitles]
+        # Repeated lines ("Yeah", "[Music]", speaker names) are translated once
+        unique_texts = list(dict.fromkeys(texts))
+        try:
+            translations = dict(zip(unique_texts, self.translate_batch(unique_texts, source_lang, target_lang)))
+            translated_texts = [translations[text] for text in texts]
+        except Exception as e:
+            logger.error(f"Failed to translate segments: {str(e)}")
+            # Keep originals if translation fails
+            translated_texts = texts
+
+        processed = [
+            {
+                'start': sub['start'],
+                'end': sub['end'],
+                'text': translated_text
+            }
+            for sub, translated_text in zip(subtitles, translated_texts)
+        ]
 
         logger.info(f"Completed translation of {len(processed)} segments")
-        if translation_errors > 0:
-            logger.warning(f"Total translation errors: {translation_errors}")
+        if processed:
+            logger.debug(f"Sample translation - Original: {texts[0]} | Translated: {translated_texts[0]}")
         
         return processed
 
@@ -466,15 +962,15 @@ class VideoService:
             message.update(data)
             
         logger.info(f"Progress update - Step: {step}, Progress: {progress}%")
-        if data:
+        if data and logger.isEnabledFor(logging.DEBUG):
             logger.debug(f"Additional data: {json.dumps(data, ensure_ascii=False)}")
             
-        return json.dumps(message)
+        return orjson.dumps(message, option=orjson.OPT_SERIALIZE_NUMPY).decode()
 
     def process_video_stream(self, video_path: str, target_lang: str, user_font_size: Optional[int] = None) -> Generator:
         """Main video processing pipeline with enhanced error handling and logging"""
-        audio_path = None
         video_id = None
+        translation_executor = None
         start_time = datetime.now()
         
         try:
@@ -493,29 +989,33 @@ class VideoService:
 
             if use_existing_segments:
                 logger.info(f"Using {len(existing_segments)} existing edited segments")
+                translated_subs = existing_segments
+                # Joined once and reused by the final progress message
+                subtitle_text = '\n'.join([s['text'] for s in translated_subs])
                 yield self._send_progress(ProcessingSteps.TRANSLATE, 80, {
-                    'translation': '\n'.join(s['text'] for s in existing_segments)
+                    'translation': subtitle_text
                 })
-                translated_subs = existing_segments
             else:
                 # Extract audio
                 yield self._send_progress(ProcessingSteps.EXTRACT_AUDIO, 10)
-                audio_path = self._extract_audio(video_path)
+                pcm = self._extract_audio(video_path)
                 yield self._send_progress(ProcessingSteps.EXTRACT_AUDIO, 30)
 
-                # Detect language
-                yield self._send_progress(ProcessingSteps.DETECT_LANGUAGE, 35)
-                source_lang = self.detect_language(audio_path)
-                logger.info(f"Detected source language: {source_lang}")
-                yield self._send_progress(ProcessingSteps.DETECT_LANGUAGE, 40, {
-                    'detected_language': source_lang
-                })
+                # Translate each finished chunk while later chunks are still being transcribed
+                translation_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='vidsub-translate')
+                pending_translations = {}
+
+                def translate_chunk(idx, language, chunk_segments):
+                    if language != target_lang and chunk_segments:
+                        pending_translations[idx] = (language, translation_executor.submit(
+                            self._process_subtitles, chunk_segments, language, target_lang))
 
-                # Transcribe
-                yield self._send_progress(ProcessingSteps.TRANSCRIBE, 45)
-                transcription = self._transcribe_with_groq(audio_path, source_lang, target_lang)
+                # Transcribe; Whisper detects the source language in the same pass
+                yield self._send_progress(ProcessingSteps.TRANSCRIBE, 40)
+                transcription = self._transcribe_with_groq(pcm, None, target_lang, on_chunk=translate_chunk)
                 segments = transcription['segments']
                 detected_language = transcription['detected_language']
+                text_language = transcription['text_language']
 
                 if not segments:
                     error_msg = "No valid subtitles generated"
@@ -525,21 +1025,26 @@ class VideoService:
                 logger.info(f"Generated {len(segments)} segments")
                 logger.info(f"Detected language from transcription: {detected_language}")
 
+                subtitle_text = '\n'.join([s['text'] for s in segments])
                 yield self._send_progress(ProcessingSteps.TRANSCRIBE, 60, {
-                    'transcription': '\n'.join(s['text'] for s in segments)
+                    'detected_language': detected_language,
+                    'transcription': subtitle_text
                 })
 
                 # Process translation
-                if detected_language != target_lang:
-                    logger.info(f"Translation needed: {detected_language} -> {target_lang}")
+                # Whisper may already have produced target-language text (English)
+                if text_language != target_lang:
+                    logger.info(f"Translation needed: {text_language} -> {target_lang}")
                     yield self._send_progress(ProcessingSteps.TRANSLATE, 65)
-                    translated_subs = self._process_subtitles(segments, detected_language, target_lang)
+                    translated_subs = self._collect_translations(
+                        transcription, pending_translations, text_language, target_lang)
+                    subtitle_text = '\n'.join([s['text'] for s in translated_subs])
                     yield self._send_progress(ProcessingSteps.TRANSLATE, 80, {
-                        'translation': '\n'.join(s['text'] for s in translated_subs)
+                        'translation': subtitle_text
                     })
                     logger.info(f"Translation completed: {len(translated_subs)} segments")
                 else:
-                    logger.info(f"No translation needed - detected language matches target: {target_lang}")
+                    logger.info(f"No translation needed - subtitle text already in target: {target_lang}")
                     translated_subs = segments
 
             # Generate subtitles
@@ -559,7 +1064,7 @@ class VideoService:
             
             yield self._send_progress(ProcessingSteps.FINALIZE, 100, {
                 'output_path': output_path,
-                'transcription': '\n'.join(s['text'] for s in translated_subs),
+                'transcription': subtitle_text,
                 'segments': translated_subs
             })
 
@@ -573,27 +1078,23 @@ class VideoService:
             raise
 
         finally:
-            if audio_path and os.path.exists(audio_path):
-                try:
-                    os.remove(audio_path)
-                    logger.debug(f"Cleaned up temporary audio file: {audio_path}")
-                except Exception as e:
-                    logger.warning(f"Failed to clean up audio file: {str(e)}")
+            if translation_executor:
+                translation_executor.shutdown(wait=False, cancel_futures=True)
 
     def _generate_srt(self, subtitles: list, target_lang: str) -> str:
         """Generate SRT file from subtitles"""
-        srt_path = os.path.join(self.output_folder, f"{uuid.uuid4()}.srt")
+        srt_path = os.path.join(self.srt_folder, f"vidsub-{uuid.uuid4()}.srt")
         logger.info(f"Generating SRT file: {srt_path}")
         logger.info(f"Processing {len(subtitles)} subtitle segments")
         
         try:
+            fmt = self._format_srt_time
+            body = ''.join(
+                f"{idx}\n{fmt(sub['start'])} --> {fmt(sub['end'])}\n{sub['text']}\n\n"
+                for idx, sub in enumerate(subtitles, start=1)
+            )
             with open(srt_path, 'w', encoding='utf-8') as srt_file:
-                for idx, sub in enumerate(subtitles, start=1):
-                    start = self._format_srt_time(sub['start'])
-                    end = self._format_srt_time(sub['end'])
-                    text = sub['text']
-                    
-                    srt_file.write(f"{idx}\n{start} --> {end}\n{text}\n\n")
+                srt_file.write(body)
 
             logger.info("SRT file generated successfully")
             return srt_path
@@ -601,19 +1102,19 @@ class VideoService:
             logger.error(f"SRT generation failed: {str(e)}")
             raise
 
-    def _format_srt_time(self, seconds: float) -> str:
+    @staticmethod
+    def _format_srt_time(seconds: float) -> str:
         """Format time for SRT format"""
-        try:
-            hours = int(seconds // 3600)
-            minutes = int((seconds % 3600) // 60)
-            seconds = seconds % 60
-            return f"{hours:02d}:{minutes:02d}:{seconds:06.3f}".replace('.', ',')
-        except Exception as e:
-            logger.error(f"Time formatting error: {str(e)}")
-            raise
-
-    def _calculate_subtitle_properties(self, width: int, height: int, user_font_size: Optional[int] = None) -> tuple:
-        """Calculate subtitle display properties based on video dimensions"""
+        # Integer milliseconds, so 59.9996s rolls over to 00:01:00,000 rather than 00:00:60,000
+        hours, ms = divmod(round(seconds * 1000), 3600000)
+        minutes, ms = divmod(ms, 60000)
+        secs, ms = divmod(ms, 1000)
+        return f"{hours:02d}:{minutes:02d}:{secs:02d},{ms:03d}"
+
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _calculate_subtitle_properties(width: int, height: int, user_font_size: Optional[int] = None) -> tuple:
+        """Calculate subtitle display properties based on video dimensions (memoized; pure in its arguments)"""
         try:
             logger.info(f"Calculating subtitle properties for dimensions: {width}x{height}")
             aspect_ratio = width / height
@@ -674,6 +1175,100 @@ class VideoService:
             logger.error(f"Subtitle scaling calculation failed: {str(e)}")
             return (24, 2, 20, 28, 50, 40)
 
+    @classmethod
+    @lru_cache(maxsize=256)
+    def _build_style_string(cls, width: int, height: int, target_lang: str, font_size: Optional[int],
+                            line_limits: bool) -> str:
+        """force_style for a video size, language and font size; identical inputs reuse the string"""
+        (font_size, max_lines, margin_v, line_height,
+         h_margin, max_chars) = cls._calculate_subtitle_properties(width, height, font_size)
+
+        font_path = get_font_path(target_lang)
+        logger.debug(f"Using font: {font_path} with size {font_size}")
+
+        style = {
+            'FontName': font_path,
+            'FontSize': font_size,
+            'PrimaryColour': '&H00FFFFFF',
+            'BackColour': '&H80000000',
+            'BorderStyle': 4,
+            'Outline': 0,
+            'Shadow': 0,
+            'MarginL': h_margin,
+            'MarginR': h_margin,
+            'MarginV': margin_v,
+            'Alignment': 2,
+            'WrapStyle': 1,
+            'PlayResX': width,
+            'PlayResY': height,
+            'LineSpacing': line_height - font_size
+        }
+        if line_limits:
+            style['MaxLineCount'] = max_lines
+            style['MaximumLineLength'] = max_chars
+        return cls._format_force_style(style)
+
+    @staticmethod
+    def _format_force_style(style: dict) -> str:
+        """Build a force_style string, rejecting anything libass would misparse.
+
+        Checked up front so a bad style fails before ffmpeg starts decoding.
+        """
+        unknown = set(style) - ASS_STYLE_KEYS
+        if unknown:
+            raise ValueError(f"Unknown subtitle style keys: {', '.join(sorted(unknown))}")
+        for key, value in style.items():
+            if any(char in str(value) for char in ",\n"):
+                raise ValueError(f"Invalid value for subtitle style {key}: {value!r}")
+        return ",".join(f"{key}={value}" for key, value in style.items())
+
+    @staticmethod
+    def _audio_codec(video_info) -> str:
+        """Copy AAC audio into the MP4 as-is; anything else is re-encoded to AAC"""
+        return 'copy' if video_info.audio_codec == 'aac' else 'aac'
+
+    def _video_encode_options(self, height: int, regenerate: bool = False) -> dict:
+        """ffmpeg output options for the subtitled video stream"""
+        encoder = Config.VIDEO_ENCODER
+        if encoder == 'auto':
+            encoder = _available_hw_encoder() or 'libx264'
+
+        # Fixed keyframe interval: no scene-cut lookahead, and cheap seeking in the player
+        gop = {'g': Config.VIDEO_GOP, 'keyint_min': Config.VIDEO_GOP} if Config.VIDEO_GOP > 0 else {}
+
+        if encoder == 'h264_nvenc':
+            return {'vcodec': encoder, 'preset': 'p4', 'rc': 'vbr', 'cq': Config.X264_CRF, 'pix_fmt': 'yuv420p', **gop}
+        if encoder == 'h264_qsv':
+            return {'vcodec': encoder, 'preset': 'faster', 'global_quality': Config.X264_CRF, 'pix_fmt': 'nv12', **gop}
+        if encoder == 'h264_videotoolbox':
+            return {'vcodec': encoder, 'q:v': 65, 'pix_fmt': 'yuv420p', **gop}
+        options = {
+            'vcodec': 'libx264',
+            'crf': Config.X264_CRF,
+            'preset': Config.X264_PRESET,
+            'pix_fmt': 'yuv420p',
+            **gop
+        }
+        if gop:
+            options['sc_threshold'] = 0
+        if Config.X264_TUNE:
+            options['tune'] = Config.X264_TUNE
+        if regenerate and not Config.X264_REGEN_CRF:
+            # Constant QP skips rate-control analysis; fine for quick font-size re-renders
+            del options['crf']
+            options['qp'] = Config.X264_REGEN_QP
+        if height >= 2160:
+            # Frame threading alone leaves cores idle on 4K+; use every core and split
+            # each frame into slices as well. Below that ffmpeg's own thread count is
+            # enough, and leaves room for the other concurrent encodes
+            options['threads'] = os.cpu_count() or 0
+            options['x264-params'] = 'sliced-threads=1:slices=8'
+        return options
+
+    def _run_encode(self, stream) -> None:
+        """Run an ffmpeg encode in the bounded encode pool and wait for it"""
+        self._encode_executor.submit(stream.run, capture_stdout=True, capture_stderr=True).result()
+
     def _burn_subtitles(self, video_path: str, srt_path: str, target_lang: str, font_size: int) -> str:
         """Burn subtitles into video"""
         try:
@@ -681,37 +1276,12 @@ class VideoService:
             logger.info(f"Burning subtitles into video: {video_path}")
             logger.info(f"Output path: {output_path}")
 
-            probe = ffmpeg.probe(video_path)
-            video_stream = next(s for s in probe['streams'] if s['codec_type'] == 'video')
-            width = int(video_stream['width'])
-            height = int(video_stream['height'])
+            video_info = probe_video(video_path)
+            width, height = video_info.width, video_info.height
 
             logger.info(f"Video dimensions: {width}x{height}")
             
-            font_size, _, margin_v, line_height, h_margin, _ = self._calculate_subtitle_properties(
-                width, height, font_size
-            )
-            
-            font_path = get_font_path(target_lang)
-            logger.debug(f"Using font: {font_path}")
-
-            style = [
-                f"FontName={font_path}",
-                f"FontSize={font_size}",
-                "PrimaryColour=&H00FFFFFF",
-                "BackColour=&H80000000",
-                "BorderStyle=4",
-                "Outline=0",
-                "Shadow=0",
-                f"MarginL={h_margin}",
-                f"MarginR={h_margin}",
-                f"MarginV={margin_v}",
-                "Alignment=2",
-                "WrapStyle=1",
-                f"PlayResX={width}",
-                f"PlayResY={height}",
-                f"LineSpacing={line_height - font_size}"
-            ]
+            style = self._build_style_string(width, height, target_lang, font_size, line_limits=False)
 
             logger.debug(f"Applied subtitle style: {style}")
 
@@ -720,7 +1290,7 @@ class VideoService:
             subtitled = input_stream.filter(
                 'subtitles',
                 srt_path,
-                force_style=",".join(style),
+                force_style=style,
                 **{
                     'charenc': 'UTF-8',
                     'original_size': f"{width}x{height}"
@@ -728,21 +1298,17 @@ class VideoService:
             )
 
             logger.info("Starting video rendering with subtitles")
-            (
+            self._run_encode(
                 ffmpeg
                 .output(
                     subtitled,
                     input_stream.audio,
                     output_path,
-                    vcodec='libx264',
-                    crf=18,
-                    preset='slow',
                     movflags='+faststart',
-                    acodec='aac',
-                    pix_fmt='yuv420p'
+                    acodec=self._audio_codec(video_info),
+                    **self._video_encode_options(height, regenerate=True)
                 )
                 .overwrite_output()
-                .run(capture_stdout=True, capture_stderr=True)
             )
             
             logger.info("Video rendering completed successfully")
@@ -753,90 +1319,54 @@ class VideoService:
             raise
 
     def _add_subtitles(self, video_path: str, subtitles: list, target_lang: str, user_font_size: Optional[int] = None) -> str:
-        """Add subtitles to video with fallback handling"""
+        """Add subtitles to video"""
         if not subtitles:
             logger.error("No subtitles provided")
             raise ValueError("No subtitles to add")
 
         output_path = os.path.join(self.output_folder, f"{uuid.uuid4()}.mp4")
-        srt_path = self._generate_srt(subtitles, target_lang)
+        srt_path = None
         
         try:
             logger.info(f"Adding subtitles to video: {video_path}")
             logger.info(f"Target output: {output_path}")
-            logger.debug(f"Using SRT file: {srt_path}")
 
-            probe = ffmpeg.probe(video_path)
-            video_stream = next(s for s in probe['streams'] if s['codec_type'] == 'video')
-            width = int(video_stream['width'])
-            height = int(video_stream['height'])
+            video_info = probe_video(video_path)
+            width, height = video_info.width, video_info.height
             
             logger.info(f"Video dimensions: {width}x{height}")
             
-            (font_size, max_lines, margin_v, line_height, 
-             h_margin, max_chars) = self._calculate_subtitle_properties(width, height, user_font_size)
-            
-            font_path = get_font_path(target_lang)
-            logger.debug(f"Using font: {font_path} with size {font_size}")
-
-            style = [
-                f"FontName={font_path}",
-                f"FontSize={font_size}",
-                "PrimaryColour=&H00FFFFFF",
-                "BackColour=&H80000000",
-                "BorderStyle=4",
-                "Outline=0",
-                "Shadow=0",
-                f"MarginL={h_margin}",
-                f"MarginR={h_margin}",
-                f"MarginV={margin_v}",
-                "Alignment=2",
-                "WrapStyle=1",
-                f"PlayResX={width}",
-                f"PlayResY={height}",
-                f"LineSpacing={line_height - font_size}",
-                f"MaxLineCount={max_lines}",
-                f"MaximumLineLength={max_chars}"
-            ]
+            style = self._build_style_string(width, height, target_lang, user_font_size, line_limits=True)
+            logger.debug(f"Applied subtitle style: {style}")
 
-            input_stream = ffmpeg.input(video_path)
-            
-            # Handle vertical video
-            if (width/height) < 0.6:
-                logger.info("Processing vertical video format")
-                scaled = input_stream.filter('scale', w='-2', h=int(height * 0.92))
-                padded = scaled.filter('pad', width, height, '(ow-iw)/2', 0)
-                final_output = padded
-            else:
-                logger.info("Processing standard video format")
-                final_output = input_stream
+            if self._use_chunked_encode(video_info):
+                logger.info(f"Starting chunked video rendering ({Config.PARALLEL_ENCODE_SEGMENTS} segments)")
+                self._encode_executor.submit(
+                    self._render_chunked, video_path, subtitles, target_lang, style, video_info, output_path
+                ).result()
+                logger.info("Video rendered successfully")
+                return output_path
 
-            subtitled = final_output.filter(
-                'subtitles',
-                srt_path,
-                force_style=",".join(style),
-                **{
-                    'charenc': 'UTF-8',
-                    'original_size': f"{width}x{height}"
-                }
-            )
+            # The chunked path writes its own per-slice SRTs
+            srt_path = self._generate_srt(subtitles, target_lang)
+            logger.debug(f"Using SRT file: {srt_path}")
+
+            input_stream = ffmpeg.input(video_path)
+            subtitled = self._subtitle_filter(self._video_layout(input_stream, width, height),
+                                              srt_path, style, width, height)
 
             logger.info("Starting video rendering")
-            (
+            self._run_encode(
                 ffmpeg
                 .output(
                     subtitled,
                     input_stream.audio,
                     output_path,
-                    vcodec='libx264',
-                    crf=18,
-                    preset='slow',
                     movflags='+faststart',
-                    acodec='aac',
-                    pix_fmt='yuv420p'
+                    acodec=self._audio_codec(video_info),
+                    **self._video_encode_options(height)
                 )
                 .overwrite_output()
-                .run(capture_stdout=True, capture_stderr=True)
             )
             logger.info("Video rendered successfully")
             return output_path
@@ -844,29 +1374,160 @@ class VideoService:
         except ffmpeg.Error as e:
             error_msg = f"FFmpeg error: {e.stderr.decode('utf-8') if e.stderr else str(e)}"
             logger.error(f"Subtitle rendering failed: {error_msg}")
-            
-            logger.info("Attempting fallback subtitle rendering")
-            try:
-                (
-                    ffmpeg
-                    .input(video_path)
-                    .output(output_path, vf=f"subtitles={srt_path}")
-                    .overwrite_output()
-                    .run()
-                )
-                logger.info("Fallback rendering successful")
-                return output_path
-            except Exception as fallback_error:
-                logger.error(f"Fallback rendering failed: {str(fallback_error)}")
-                raise
+            raise RuntimeError(error_msg)
 
         except Exception as e:
             logger.error(f"Video processing failed: {str(e)}")
             raise
         finally:
-            if os.path.exists(srt_path):
+            if srt_path and os.path.exists(srt_path):
                 try:
                     os.remove(srt_path)
                     logger.debug(f"Cleaned up SRT file: {srt_path}")
                 except Exception as e:
-                    logger.warning(f"Error removing SRT: {str(e)}")
\ No newline at end of file
+                    logger.warning(f"Error removing SRT: {str(e)}")
+
+    def _video_layout(self, input_stream, width: int, height: int):
+        """Shrink and pad vertical video so subtitles have room below the picture"""
+        if (width/height) < 0.6:
+            logger.info("Processing vertical video format")
+            scaled = input_stream.filter('scale', w='-2', h=int(height * 0.92))
+            return scaled.filter('pad', width, height, '(ow-iw)/2', 0)
+        logger.info("Processing standard video format")
+        return input_stream
+
+    def _subtitle_filter(self, stream, srt_path: str, style: str, width: int, height: int):
+        return stream.filter(
+            'subtitles',
+            srt_path,
+            force_style=style,
+            **{
+                'charenc': 'UTF-8',
+                'original_size': f"{width}x{height}"
+            }
+        )
+
+    def _use_chunked_encode(self, video_info) -> bool:
+        return (Config.PARALLEL_ENCODE_SEGMENTS > 1
+                and video_info.duration >= Config.PARALLEL_ENCODE_MIN_SECONDS
+                and video_info.frame_rate is not None
+                and video_info.frame_count >= Config.PARALLEL_ENCODE_SEGMENTS
+                and self._video_encode_options(video_info.height)['vcodec'] == 'libx264')
+
+    def _render_chunked(self, video_path: str, subtitles: list, target_lang: str, style: str,
+                        video_info, output_path: str) -> None:
+        """Encode frame ranges of the video in parallel, then stream-copy them together and mux the audio"""
+        segments = Config.PARALLEL_ENCODE_SEGMENTS
+        width, height = video_info.width, video_info.height
+        fps = video_info.frame_rate
+        # Whole-frame boundaries, so the slices add up to exactly the source's frames
+        # and the concatenated video can't drift against the audio muxed in whole
+        bounds = [idx * video_info.frame_count // segments for idx in range(segments + 1)]
+        options = self._video_encode_options(height)
+        options['threads'] = max(1, (os.cpu_count() or 1) // segments)
+
+        work_files = []
+        try:
+            chunk_paths = []
+            with ThreadPoolExecutor(max_workers=segments, thread_name_prefix='vidsub-chunk') as pool:
+                futures = []
+                for idx in range(segments):
+                    first, last = bounds[idx], bounds[idx + 1]
+                    start = float(first / fps)
+                    end = float(last / fps)
+                    # Accurate input seeking restarts timestamps at 0, so each slice gets its own shifted SRT
+                    chunk_subs = [
+                        {'start': max(sub['start'] - start, 0.0), 'end': sub['end'] - start, 'text': sub['text']}
+                        for sub in subtitles
+                        if sub['end'] > start and sub['start'] < end
+                    ]
+                    chunk_path = os.path.join(self.output_folder, f"{uuid.uuid4()}.mp4")
+                    work_files.append(chunk_path)
+                    chunk_paths.append(chunk_path)
+
+                    # Seek half a frame early so float rounding can't skip frame `first`
+                    seek = float((first - Fraction(1, 2)) / fps) if first else 0
+                    video = self._video_layout(ffmpeg.input(video_path, ss=seek), width, height)
+                    if chunk_subs:
+                        chunk_srt = self._generate_srt(chunk_subs, target_lang)
+                        work_files.append(chunk_srt)
+                        video = self._subtitle_filter(video, chunk_srt, style, width, height)
+
+                    slice_options = dict(options)
+                    if idx < segments - 1:
+                        # The last slice runs to the end in case frame_count was estimated from duration
+                        slice_options['frames:v'] = last - first
+                    stream = ffmpeg.output(video, chunk_path, an=None, **slice_options).overwrite_output()
+                    futures.append(pool.submit(stream.run, capture_stdout=True, capture_stderr=True))
+                for future in futures:
+                    future.result()
+
+            list_path = os.path.join(self.output_folder, f"{uuid.uuid4()}.txt")
+            work_files.append(list_path)
+            with open(list_path, 'w') as list_file:
+                list_file.write(''.join(f"file '{path}'\n" for path in chunk_paths))
+
+            streams = [ffmpeg.input(list_path, f='concat', safe=0).video]
+            audio_options = {}
+            if video_info.audio_codec is not None:
+                streams.append(ffmpeg.input(video_path).audio)
+                audio_options['acodec'] = self._audio_codec(video_info)
+            (
+                ffmpeg
+                .output(
+                    *streams,
+                    output_path,
+                    vcodec='copy',
+                    movflags='+faststart',
+                    **audio_options
+                )
+                .overwrite_output()
+                .run(capture_stdout=True, capture_stderr=True)
+            )
+        finally:
+            for path in work_files:
+                if os.path.exists(path):
+                    try:
+                        os.remove(path)
+                    except Exception as e:
+                        logger.warning(f"Error removing chunk file: {str(e)}")
+
+_video_service = None
+_video_service_lock = threading.Lock()
+
+def get_video_service(warmup: bool = True) -> VideoService:
+    """Return the process-wide VideoService, creating it on first use.
+
+    A newly created service starts its background warmup unless warmup=False,
+    which the gunicorn master uses so it stays thread-free before forking.
+    """
+    global _video_service
+    if _video_service is None:
+        with _video_service_lock:
+            if _video_service is None:
+                _video_service = VideoService()
+                if warmup:
+                    _video_service.start_warmup()
+    return _video_service
+
+def _reset_after_fork():
+    """Drop state that must not be shared with a forked worker"""
+    global _video_service_lock
+    _video_service_lock = threading.Lock()
+    # Re-probe the device in the child rather than trusting the parent's answer
+    _translation_device.cache_clear()
+    if _video_service is not None:
+        # The Groq client's connection pool belongs to the parent process
+        _video_service.client = None
+        # Locks held by parent threads at fork time would never be released
+        _video_service._translation_load_locks = {}
+        _video_service._translation_load_locks_guard = threading.Lock()
+        _video_service._translation_models_lock = threading.Lock()
+        # Executor threads and queue belong to the parent
+        _video_service._encode_executor = ThreadPoolExecutor(
+            max_workers=Config.MAX_CONCURRENT_ENCODES,
+            thread_name_prefix='vidsub-encode'
+        )
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
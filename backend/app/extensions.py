@@ -1,5 +1,109 @@
+import hashlib
+import os
+import threading
+import time
+from cachetools import TTLCache
 from flask_bcrypt import Bcrypt
 from flask_jwt_extended import JWTManager
+from flask_jwt_extended.config import config as jwt_config
+from pymongo import MongoClient
+
+
+class CachingJWTManager(JWTManager):
+    """JWTManager that keeps verified token payloads in a short-lived LRU.
+
+    Repeated requests carrying the same token skip signature verification
+    until the cache TTL or the token's own expiry, whichever comes first.
+    """
+
+    def __init__(self, app=None, add_context_processor=False):
+        self._token_cache = TTLCache(maxsize=10000, ttl=5)
+        self._token_cache_lock = threading.Lock()
+        super().__init__(app, add_context_processor)
+
+    def init_app(self, app, add_context_processor=False):
+        super().init_app(app, add_context_processor)
+        with self._token_cache_lock:
+            self._token_cache = TTLCache(
+                maxsize=app.config.get('JWT_CACHE_MAX', 10000),
+                ttl=app.config.get('JWT_CACHE_TTL', 5)
+            )
+
+    def clear_token_cache(self):
+        with self._token_cache_lock:
+            self._token_cache.clear()
+
+    def _decode_jwt_from_config(self, encoded_token, csrf_value=None, allow_expired=False):
+        if csrf_value is not None or allow_expired:
+            return super()._decode_jwt_from_config(encoded_token, csrf_value, allow_expired)
+
+        key_material = f"{encoded_token}|{jwt_config.decode_audience}|{jwt_config.decode_issuer}"
+        key = hashlib.blake2b(key_material.encode(), digest_size=16).digest()
+        now = time.time()
+
+        with self._token_cache_lock:
+            cached = self._token_cache.get(key)
+        if cached is not None:
+            payload, expires_at = cached
+            if expires_at > now:
+                return dict(payload)
+            with self._token_cache_lock:
+                self._token_cache.pop(key, None)
+
+        # Never cache failures; let the full decode raise as usual
+        payload = super()._decode_jwt_from_config(encoded_token, csrf_value, allow_expired)
+        expires_at = now + self._token_cache.ttl
+        if 'exp' in payload:
+            expires_at = min(expires_at, payload['exp'])
+        with self._token_cache_lock:
+            self._token_cache[key] = (payload, expires_at)
+        return dict(payload)
+
+
+class Mongo:
+    """One MongoClient per process, shared by every request.
+
+    The client is created on first use rather than in init_app so a gunicorn
+    master that imports the app never hands its sockets to forked workers.
+    """
+
+    def __init__(self, app=None):
+        self._uri = None
+        self._client = None
+        self._pid = None
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self._uri = app.config.get('MONGODB_URI')
+        app.extensions['mongo'] = self
+
+    @property
+    def client(self) -> MongoClient:
+        pid = os.getpid()
+        if self._client is None or self._pid != pid:
+            with self._lock:
+                if self._client is None or self._pid != pid:
+                    if not self._uri:
+                        raise ValueError("MongoDB URI not configured")
+                    self._client = MongoClient(self._uri)
+                    self._pid = pid
+        return self._client
+
+    @property
+    def db(self):
+        return self.client.get_default_database()
+
+    def close(self):
+        """Close this process's client; the next use opens a fresh one."""
+        with self._lock:
+            if self._client is not None:
+                self._client.close()
+            self._client = None
+            self._pid = None
+
 
 bcrypt = Bcrypt()
-jwt = JWTManager()
\ No newline at end of file
+jwt = CachingJWTManager()
+mongo = Mongo()
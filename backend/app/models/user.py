@@ -1,29 +1,38 @@
-from pymongo import MongoClient
-from flask import current_app, g
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError, OperationFailure, PyMongoError
 from bson import ObjectId
+from app.extensions import mongo
+import logging
 import re
 
+logger = logging.getLogger(__name__)
+
 class User:
-    def __init__(self, app=None):
-        if app is not None:
-            self.init_app(app)
+    _EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+    _indexes_created = False
+
+    @classmethod
+    def ensure_indexes(cls):
+        """Create the users indexes once, at startup.
 
-    def init_app(self, app):
-        """Initialize the user model with the Flask app context."""
-        app.teardown_appcontext(self.teardown)
+        Failure is logged rather than raised so auth keeps working without the
+        index (signup falls back to the email_exists check); it is not retried.
+        """
+        if cls._indexes_created:
+            return
+        try:
+            # Point lookups by email, and a hard guarantee against duplicate accounts
+            mongo.db.users.create_index('email', unique=True)
+        except (DuplicateKeyError, OperationFailure) as e:
+            logger.error(f"Could not create unique email index on users: {str(e)}")
+        except PyMongoError as e:
+            logger.error(f"Could not reach MongoDB to create users indexes: {str(e)}")
+        finally:
+            cls._indexes_created = True
 
     def get_db(self):
-        """Get or create a database connection."""
-        if 'mongodb_client' not in g:
-            g.mongodb_client = MongoClient(current_app.config['MONGODB_URI'])
-            g.db = g.mongodb_client[g.mongodb_client.get_default_database().name]
-        return g.db
-
-    def teardown(self, exception):
-        """Close the database connection at the end of the request."""
-        client = g.pop('mongodb_client', None)
-        if client is not None:
-            client.close()
+        """Get the database from the shared, pooled client."""
+        return mongo.db
 
     def create_user(self, name, email, password_hash):
         user_data = {
@@ -37,13 +46,24 @@ class User:
     def find_by_email(self, email):
         return self.get_db().users.find_one({'email': email})
 
+    def email_exists(self, email):
+        """Check for an account without fetching the document."""
+        return self.get_db().users.find_one({'email': email}, {'_id': 1}) is not None
+
     def validate_email(self, email):
-        email_regex = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        return re.match(email_regex, email) is not None
+        return self._EMAIL_RE.match(email) is not None
     
     def update_user(self, email, updates):
         """Update user document with the provided updates."""
         return self.get_db().users.update_one(
             {'email': email},
             {'$set': updates}
-        )
\ No newline at end of file
+        )
+
+    def update_user_return_new(self, email, updates):
+        """Update the user and return the updated document in a single round trip."""
+        return self.get_db().users.find_one_and_update(
+            {'email': email},
+            {'$set': updates},
+            return_document=ReturnDocument.AFTER
+        )
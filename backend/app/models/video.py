@@ -1,16 +1,17 @@
 from datetime import datetime
 from bson import ObjectId
-from flask import current_app, g
-from pymongo import MongoClient, DESCENDING
+from pymongo import DESCENDING
 import os
 import shutil
 import logging
 from typing import List, Dict, Any
+from ..utils.media import clear_probe_cache
+from ..extensions import mongo
 
 logger = logging.getLogger(__name__)
 
 class Video:
-    def __init__(self, app=None):
+    def __init__(self):
         self.base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
         self.upload_folder = os.path.join(self.base_dir, 'uploads')
         self.output_folder = os.path.join(self.base_dir, 'uploads', 'output')
@@ -18,33 +19,10 @@ class Video:
         os.makedirs(self.upload_folder, exist_ok=True)
         os.makedirs(self.output_folder, exist_ok=True)
 
-        if app is not None:
-            self.init_app(app)
-
-    def init_app(self, app):
-        app.teardown_appcontext(self.teardown)
-
     def get_db(self):
-        if 'mongodb_client' not in g:
-            mongodb_uri = current_app.config.get('MONGODB_URI')
-            if not mongodb_uri:
-                raise ValueError("MongoDB URI not configured")
-            
-            g.mongodb_client = MongoClient(mongodb_uri)
-            db_name = mongodb_uri.split('/')[-1].split('?')[0]
-            g.db = g.mongodb_client[db_name]
-        return g.db.videos
-
-    def teardown(self, exception):
-        client = g.pop('mongodb_client', None)
-        if client is not None:
-            try:
-                client.close()
-                logger.debug("MongoDB connection closed")
-            except Exception as e:
-                logger.error(f"Error closing MongoDB connection: {str(e)}")
-
-    def create_video(self, user_id: str, filename: str, original_path: str):
+        return mongo.db.videos
+
+    def create_video(self, user_id: str, filename: str, original_path: str, original_filename: str = None):
         try:
             logger.info(f"Creating video entry for user: {user_id}")
             if not os.path.exists(original_path):
@@ -54,13 +32,13 @@ class Video:
             logger.debug(f"Original path: {original_path}, New path: {new_upload_path}")
 
             if original_path != new_upload_path:
-                logger.debug("Copying video to upload folder")
-                shutil.copy2(original_path, new_upload_path)
+                self._move_into_uploads(original_path, new_upload_path)
 
             video_data = {
                 '_id': ObjectId(),
                 'user_id': user_id,
                 'filename': filename,
+                'original_filename': original_filename or filename,
                 'original_path': new_upload_path,
                 'status': 'uploaded',
                 'progress': 0,
@@ -84,6 +62,24 @@ class Video:
                     logger.error(f"Cleanup error: {str(cleanup_error)}")
             raise
 
+    def _move_into_uploads(self, source: str, destination: str) -> None:
+        """Move a file into the upload folder without copying its bytes when possible"""
+        try:
+            os.rename(source, destination)
+            logger.debug("Moved video into upload folder")
+            return
+        except OSError:
+            pass
+        # Different filesystem: a hardlink still avoids the copy if both sit on one volume
+        try:
+            os.link(source, destination)
+            logger.debug("Linked video into upload folder")
+            return
+        except OSError:
+            pass
+        logger.debug("Copying video to upload folder")
+        shutil.copy2(source, destination)
+
     def get_video(self, video_id: str) -> Dict[str, Any]:
         try:
             logger.debug(f"Fetching video: {video_id}")
@@ -134,9 +130,10 @@ class Video:
                 'updated_at': datetime.utcnow()
             }
 
+            # Segments may differ from the last /update_subtitles body now
             result = self.get_db().update_one(
                 {'_id': ObjectId(video_id)},
-                {'$set': update_data}
+                {'$set': update_data, '$unset': {'segments_hash': ''}}
             )
             logger.debug(f"Output path update result: {result.modified_count} modified")
             return result
@@ -158,6 +155,7 @@ class Video:
                 if 'output_path' in video and os.path.exists(video['output_path']):
                     logger.debug(f"Removing output file: {video['output_path']}")
                     os.remove(video['output_path'])
+                clear_probe_cache()
                 result = self.get_db().delete_one({'_id': ObjectId(video_id)})
                 logger.info(f"Deleted video: {video_id}")
                 return result
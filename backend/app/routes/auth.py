@@ -1,12 +1,26 @@
 from flask import Blueprint, request, jsonify
-from app.extensions import bcrypt, jwt
+from app.extensions import jwt
 from app.models.user import User
 from app.utils.validators import validate_password
+from app.utils.passwords import check_password, hash_password
 from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
+from pymongo.errors import DuplicateKeyError
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Request fields that are safe to log; never passwords
+_LOGGED_FIELDS = ('name', 'email')
 
 auth_bp = Blueprint('auth', __name__)
 user_model = User()
 
+def _loggable(data):
+    """Whitelisted view of a request body for debug logs."""
+    if not isinstance(data, dict):
+        return None
+    return {k: data.get(k) for k in _LOGGED_FIELDS}
+
 @auth_bp.route('/signup', methods=['POST', 'OPTIONS'])
 def signup():
     if request.method == "OPTIONS":
@@ -15,8 +29,8 @@ def signup():
     try:
         data = request.get_json()
         
-        # Log received data for debugging
-        print("Received signup data:", data)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Received signup data: %s", _loggable(data))
         
         # Validate required fields
         name = data.get('name')
@@ -45,17 +59,23 @@ def signup():
             }), 400
 
         # Check if user already exists
-        if user_model.find_by_email(email):
+        if user_model.email_exists(email):
             return jsonify({
                 'error': 'Email already registered',
                 'details': 'Please use a different email address'
             }), 409
 
         # Hash password
-        password_hash = bcrypt.generate_password_hash(password).decode('utf-8')
+        password_hash = hash_password(password)
 
-        # Create user
-        user = user_model.create_user(name, email, password_hash)
+        # Create user; the unique index catches signups racing past the check above
+        try:
+            user = user_model.create_user(name, email, password_hash)
+        except DuplicateKeyError:
+            return jsonify({
+                'error': 'Email already registered',
+                'details': 'Please use a different email address'
+            }), 409
 
         # Generate access token
         access_token = create_access_token(identity=email)
@@ -71,8 +91,7 @@ def signup():
         }), 201
         
     except Exception as e:
-        # Log error for debugging
-        print("Error in signup:", str(e))
+        logger.error("Error in signup: %s", e, exc_info=True)
         return jsonify({
             'error': 'Server error',
             'details': 'An unexpected error occurred'
@@ -86,8 +105,8 @@ def login():
     try:
         data = request.get_json()
         
-        # Log received data for debugging
-        print("Received login data:", data)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Received login data: %s", _loggable(data))
         
         email = data.get('email')
         password = data.get('password')
@@ -107,7 +126,7 @@ def login():
             }), 401
 
         # Check password
-        if not bcrypt.check_password_hash(user['password'], password):
+        if not check_password(user['password'], password):
             return jsonify({
                 'error': 'Authentication failed',
                 'details': 'Invalid email or password'
@@ -127,7 +146,7 @@ def login():
         }), 200
         
     except Exception as e:
-        print("Error in login:", str(e))
+        logger.error("Error in login: %s", e, exc_info=True)
         return jsonify({
             'error': 'Server error',
             'details': 'An unexpected error occurred'
@@ -159,7 +178,7 @@ def validate_token():
             }), 200
             
         except Exception as e:
-            print("Error in token validation:", str(e))
+            logger.error("Error in token validation: %s", e, exc_info=True)
             return jsonify({
                 'error': 'Server error'
             }), 500
@@ -180,7 +199,7 @@ def logout():
         }), 200
         
     except Exception as e:
-        print("Error in logout:", str(e))
+        logger.error("Error in logout: %s", e, exc_info=True)
         return jsonify({
             'error': 'Server error',
             'details': 'An unexpected error occurred'
@@ -188,7 +207,7 @@ def logout():
 
 @auth_bp.errorhandler(Exception)
 def handle_error(error):
-    print("Unhandled error:", str(error))
+    logger.error("Unhandled error: %s", error, exc_info=error)
     return jsonify({
         'error': 'Server error',
         'details': 'An unexpected error occurred'
@@ -202,13 +221,6 @@ def update_profile():
         
     try:
         current_user_email = get_jwt_identity()
-        user = user_model.find_by_email(current_user_email)
-        
-        if not user:
-            return jsonify({
-                'error': 'User not found'
-            }), 404
-
         data = request.get_json()
         updates = {}
         
@@ -219,7 +231,7 @@ def update_profile():
         # Update email if provided and different
         if 'email' in data and data['email'] != current_user_email:
             # Check if new email already exists
-            if user_model.find_by_email(data['email']):
+            if user_model.email_exists(data['email']):
                 return jsonify({
                     'error': 'Email already exists'
                 }), 409
@@ -233,12 +245,22 @@ def update_profile():
                     'error': 'Invalid password',
                     'details': password_errors
                 }), 400
-            updates['password'] = bcrypt.generate_password_hash(data['password']).decode('utf-8')
+            updates['password'] = hash_password(data['password'])
 
         if updates:
-            user_model.update_user(current_user_email, updates)
-            
-        updated_user = user_model.find_by_email(updates.get('email', current_user_email))
+            try:
+                updated_user = user_model.update_user_return_new(current_user_email, updates)
+            except DuplicateKeyError:
+                return jsonify({
+                    'error': 'Email already exists'
+                }), 409
+        else:
+            updated_user = user_model.find_by_email(current_user_email)
+
+        if not updated_user:
+            return jsonify({
+                'error': 'User not found'
+            }), 404
         
         return jsonify({
             'user': {
@@ -250,7 +272,7 @@ def update_profile():
         }), 200
         
     except Exception as e:
-        print("Error in profile update:", str(e))
+        logger.error("Error in profile update: %s", e, exc_info=True)
         return jsonify({
             'error': 'Server error'
         }), 500
\ No newline at end of file
@@ -1,22 +1,58 @@
-from flask import Blueprint, request, jsonify, Response, stream_with_context, send_file, make_response, current_app
+from flask import Blueprint, request, jsonify, Response, stream_with_context, send_file
 from flask_jwt_extended import jwt_required, get_jwt_identity, decode_token
+from werkzeug.exceptions import RequestEntityTooLarge
 from werkzeug.utils import secure_filename
 from functools import wraps
 from bson import ObjectId
-from datetime import datetime
-from ..core.video_service import VideoService
+from ..core.video_service import get_video_service
 from ..models.video import Video
+import hashlib
 import json
 import os
+import shutil
+import threading
+import time
+import uuid
 import logging
+import orjson
+from cachetools import TTLCache
 
 logger = logging.getLogger(__name__)
 
 video_bp = Blueprint('video', __name__)
 video_model = Video()
 
+@video_bp.record_once
+def _configure_upload_spooling(state):
+    # Multipart uploads are parsed straight into the upload folder (see SpoolingRequest)
+    state.app.config.setdefault('UPLOAD_SPOOL_DIR', video_model.upload_folder)
+
 ALLOWED_EXTENSIONS = {'mp4', 'mov', 'avi', 'mkv'}
-MAX_FILE_SIZE = 500 * 1024 * 1024
+UPLOAD_CHUNK_SIZE = 2 * 1024 * 1024
+
+# Status and download polling re-read the same documents every second or two;
+# a short TTL absorbs that while writes through this module invalidate it
+_video_cache = TTLCache(maxsize=4096, ttl=1)
+_video_cache_lock = threading.Lock()
+
+def _get_video_cached(video_id):
+    with _video_cache_lock:
+        video = _video_cache.get(video_id)
+    if video is None:
+        video = video_model.get_video(video_id)
+        # Misses aren't cached so a just-created video shows up immediately
+        if video is not None:
+            with _video_cache_lock:
+                _video_cache[video_id] = video
+    return video
+
+def _invalidate_video(video_id):
+    with _video_cache_lock:
+        _video_cache.pop(video_id, None)
+
+def clear_video_cache():
+    with _video_cache_lock:
+        _video_cache.clear()
 
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
@@ -38,27 +74,57 @@ def jwt_required_with_url_token():
         return decorator
     return wrapper
 
+_SSE_HEADERS = {
+    'Content-Type': 'text/event-stream',
+    'Cache-Control': 'no-cache',
+    'Connection': 'keep-alive',
+    'X-Accel-Buffering': 'no'
+}
+
+def _sse_response(body, status=200):
+    # CORS headers are added by the FastCORS middleware for allowed origins
+    return Response(body, mimetype='text/event-stream', status=status, headers=_SSE_HEADERS)
+
+def _sse_event(data: str) -> bytes:
+    """Frame one SSE event as bytes so werkzeug passes it through without re-encoding."""
+    return b"data: " + data.encode() + b"\n\n"
+
+def _sse_json(obj) -> bytes:
+    """Frame an object as an SSE event; orjson already produces UTF-8 bytes."""
+    return b"data: " + orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY) + b"\n\n"
+
+def _sse_error(msg, status=200):
+    """Single-event SSE response carrying an error message."""
+    return _sse_response(_sse_json({'error': msg}), status=status)
+
 def validate_video_id(video_id):
     if not video_id or not ObjectId.is_valid(video_id):
         return False, "Invalid video ID format"
     return True, None
 
+_SEGMENT_KEYS = ('start', 'end', 'text')
+_NUMBER_TYPES = frozenset({int, float})
+
 def validate_subtitle_segments(segments):
     if not isinstance(segments, list):
         return False, "Subtitles must be an array"
-    
-    required_keys = {'start', 'end', 'text'}
+
+    # Runs once per segment on every save/regenerate, so keep the loop allocation-free
+    number_types = _NUMBER_TYPES
     for idx, segment in enumerate(segments):
         if not isinstance(segment, dict):
             return False, f"Segment {idx} is not an object"
-        missing_keys = required_keys - segment.keys()
-        if missing_keys:
+        if 'start' not in segment or 'end' not in segment or 'text' not in segment:
+            missing_keys = [key for key in _SEGMENT_KEYS if key not in segment]
             return False, f"Segment {idx} missing keys: {', '.join(missing_keys)}"
-        if not isinstance(segment['start'], (int, float)) or segment['start'] < 0:
+        start = segment['start']
+        end = segment['end']
+        text = segment['text']
+        if type(start) not in number_types or start < 0:
             return False, f"Segment {idx} has invalid start time"
-        if not isinstance(segment['end'], (int, float)) or segment['end'] <= segment['start']:
+        if type(end) not in number_types or end <= start:
             return False, f"Segment {idx} has invalid end time"
-        if not isinstance(segment['text'], str) or len(segment['text'].strip()) == 0:
+        if type(text) is not str or not text.strip():
             return False, f"Segment {idx} has invalid text"
     return True, None
 
@@ -79,23 +145,24 @@ def upload_video():
             logger.warning(f"Invalid file type attempted: {file.filename}")
             return jsonify({'error': 'Invalid file type. Allowed types: mp4, mov, avi, mkv'}), 400
 
-        if request.content_length > MAX_FILE_SIZE:
-            logger.warning(f"File size exceeded limit: {request.content_length}")
-            return jsonify({'error': 'File size exceeds maximum limit (500MB)'}), 400
-
-        filename = secure_filename(file.filename)
-        unique_filename = f"{os.urandom(8).hex()}_{filename}"
+        # Stored under a random ID; the sanitized client name only goes into the document
+        unique_filename = f"{uuid.uuid4().hex}{os.path.splitext(file.filename)[1].lower()}"
         upload_path = os.path.join(video_model.upload_folder, unique_filename)
         
         logger.info(f"Starting file upload: {unique_filename}")
-        file.save(upload_path)
+        # Normally the body was already spooled into the upload folder while
+        # parsing, so this is a rename; copy only if it landed elsewhere
+        if not request.claim_spooled_file(file, upload_path):
+            with open(upload_path, 'wb', buffering=0) as dst:
+                shutil.copyfileobj(file.stream, dst, UPLOAD_CHUNK_SIZE)
         logger.debug(f"File saved to: {upload_path}")
 
         user_id = get_jwt_identity()
         video_doc = video_model.create_video(
             user_id=user_id,
             filename=unique_filename,
-            original_path=upload_path
+            original_path=upload_path,
+            original_filename=secure_filename(file.filename)
         )
 
         logger.info(f"Video document created: {video_doc.inserted_id}")
@@ -105,6 +172,9 @@ def upload_video():
             'filename': unique_filename
         }), 200
 
+    except RequestEntityTooLarge:
+        # MAX_CONTENT_LENGTH tripped while reading the body; answered by the app's 413 handler
+        raise
     except Exception as e:
         logger.error(f"Upload error: {str(e)}", exc_info=True)
         if 'upload_path' in locals() and os.path.exists(upload_path):
@@ -119,10 +189,6 @@ def upload_video():
 @jwt_required_with_url_token()
 def process_video():
     try:
-        if not hasattr(current_app, 'video_service'):
-            current_app.video_service = VideoService()
-            logger.info("VideoService initialized")
-
         if request.method == 'POST':
             data = request.get_json()
             video_id = data.get('video_id')
@@ -165,31 +231,21 @@ def process_video():
 
             def generate():
                 try:
-                    for progress_data in current_app.video_service.process_video_stream(
+                    for progress_data in get_video_service().process_video_stream(
                         video_path,
                         target_lang,
                         font_size
                     ):
                         logger.debug(f"Sending SSE update: {progress_data}")
-                        yield f"data: {progress_data}\n\n"
+                        yield _sse_event(progress_data)
                 except Exception as e:
                     error_msg = str(e)
                     logger.error(f"SSE generation error: {error_msg}", exc_info=True)
                     video_model.update_status(video_id, 'failed', error_msg)
-                    yield f"data: {json.dumps({'error': error_msg})}\n\n"
-
-            return Response(
-                stream_with_context(generate()),
-                mimetype='text/event-stream',
-                headers={
-                    'Content-Type': 'text/event-stream',
-                    'Cache-Control': 'no-cache',
-                    'X-Accel-Buffering': 'no',
-                    'Connection': 'keep-alive',
-                    'Access-Control-Allow-Origin': request.headers.get('Origin', '*'),
-                    'Access-Control-Allow-Credentials': 'true'
-                }
-            )
+                    _invalidate_video(video_id)
+                    yield _sse_json({'error': error_msg})
+
+            return _sse_response(stream_with_context(generate()))
 
     except Exception as e:
         logger.error(f"Processing error: {str(e)}", exc_info=True)
@@ -204,7 +260,7 @@ def download_video(video_id):
             logger.warning(f"Invalid video ID for download: {video_id}")
             return jsonify({'error': error_msg}), 400
 
-        video = video_model.get_video(video_id)
+        video = _get_video_cached(video_id)
         if not video:
             logger.warning(f"Video not found for download: {video_id}")
             return jsonify({'error': 'Video not found'}), 404
@@ -218,15 +274,12 @@ def download_video(video_id):
             return jsonify({'error': 'Output video file not found'}), 404
 
         logger.info(f"Serving download for video: {video_id}")
-        response = send_file(
+        return send_file(
             video['output_path'],
             mimetype='video/mp4',
             as_attachment=True,
-            download_name=f"subtitled_{video['filename']}"
+            download_name=f"subtitled_{video.get('original_filename') or video['filename']}"
         )
-        response.headers['Access-Control-Allow-Origin'] = request.headers.get('Origin', '*')
-        response.headers['Access-Control-Allow-Credentials'] = 'true'
-        return response
 
     except Exception as e:
         logger.error(f"Download error: {str(e)}", exc_info=True)
@@ -240,7 +293,7 @@ def get_video_status(video_id):
         if not is_valid:
             return jsonify({'error': error_msg}), 400
 
-        video = video_model.get_video(video_id)
+        video = _get_video_cached(video_id)
         if not video:
             logger.warning(f"Status check for non-existent video: {video_id}")
             return jsonify({'error': 'Video not found'}), 404
@@ -267,9 +320,35 @@ def get_video_status(video_id):
 @jwt_required()
 def update_subtitles(video_id):
     try:
-        start_time = datetime.now()
+        start_time = time.monotonic()
         logger.info(f"Starting subtitle update for video: {video_id}")
         
+        video = video_model.get_video(video_id)
+        if not video:
+            logger.warning(f"Video not found for subtitle update: {video_id}")
+            return jsonify({'error': 'Video not found'}), 404
+
+        # A save with no edits resends the exact body of the last one; skip
+        # validating and rewriting thousands of segments in that case, but
+        # still reset the status so a failed video can be regenerated
+        segments_hash = hashlib.blake2b(request.get_data(cache=True), digest_size=16).hexdigest()
+        if video.get('segments_hash') == segments_hash:
+            logger.info(f"Segments unchanged for video: {video_id}")
+            video_model.get_db().update_one(
+                {'_id': ObjectId(video_id)},
+                {
+                    '$set': {'status': 'processing', 'progress': 0},
+                    '$unset': {'error': ''},
+                    '$currentDate': {'updated_at': True}
+                }
+            )
+            _invalidate_video(video_id)
+            return jsonify({
+                'message': 'Subtitles updated successfully',
+                'video_id': video_id,
+                'unchanged': True
+            }), 200
+
         data = request.get_json()
         if not data:
             logger.warning("No JSON data in subtitle update request")
@@ -285,28 +364,29 @@ def update_subtitles(video_id):
             logger.warning(f"Invalid subtitle segments: {error_msg}")
             return jsonify({'error': f"Invalid subtitle format: {error_msg}"}), 400
             
-        video = video_model.get_video(video_id)
-        if not video:
-            logger.warning(f"Video not found for subtitle update: {video_id}")
-            return jsonify({'error': 'Video not found'}), 404
-            
         logger.debug(f"Updating segments for video: {video_id}")
         update_result = video_model.get_db().update_one(
             {'_id': ObjectId(video_id)},
-            {'$set': {
-                'segments': segments,
-                'status': 'processing',
-                'progress': 0,
-                'updated_at': datetime.utcnow()
-            }}
+            {
+                '$set': {
+                    'segments': segments,
+                    'segments_hash': segments_hash,
+                    'status': 'processing',
+                    'progress': 0
+                },
+                '$unset': {'error': ''},
+                '$currentDate': {'updated_at': True}
+            }
         )
         
+        _invalidate_video(video_id)
+
         if update_result.modified_count == 0:
             logger.error(f"Failed to update segments for video: {video_id}")
             return jsonify({'error': 'Failed to update subtitles'}), 500
             
         logger.info(f"Successfully updated segments for video: {video_id}")
-        logger.debug(f"Segments update took: {(datetime.now() - start_time).total_seconds()} seconds")
+        logger.debug(f"Segments update took: {time.monotonic() - start_time:.3f} seconds")
         
         return jsonify({
             'message': 'Subtitles updated successfully',
@@ -321,42 +401,15 @@ def update_subtitles(video_id):
 @jwt_required_with_url_token()
 def regenerate_video(video_id):
     try:
-        # Initialize service if needed
-        if not hasattr(current_app, 'video_service'):
-            current_app.video_service = VideoService()
-            logger.info("VideoService initialized for regeneration")
-
         # Validate video_id
         if not ObjectId.is_valid(video_id):
-            return Response(
-                f"data: {json.dumps({'error': 'Invalid video ID'})}\n\n",
-                mimetype='text/event-stream',
-                headers={
-                    'Content-Type': 'text/event-stream',
-                    'Cache-Control': 'no-cache',
-                    'Connection': 'keep-alive',
-                    'X-Accel-Buffering': 'no',
-                    'Access-Control-Allow-Origin': request.headers.get('Origin', '*'),
-                    'Access-Control-Allow-Credentials': 'true'
-                }
-            )
+            return _sse_error('Invalid video ID')
 
         # Parse and validate segments
         try:
-            segments = json.loads(request.args.get('segments', '[]'))
+            segments = orjson.loads(request.args.get('segments', '[]'))
         except json.JSONDecodeError:
-            return Response(
-                f"data: {json.dumps({'error': 'Invalid segments data'})}\n\n",
-                mimetype='text/event-stream',
-                headers={
-                    'Content-Type': 'text/event-stream',
-                    'Cache-Control': 'no-cache',
-                    'Connection': 'keep-alive',
-                    'X-Accel-Buffering': 'no',
-                    'Access-Control-Allow-Origin': request.headers.get('Origin', '*'),
-                    'Access-Control-Allow-Credentials': 'true'
-                }
-            )
+            return _sse_error('Invalid segments data')
 
         font_size = int(request.args.get('font_size', 20))
         target_lang = request.args.get('target_language', 'en')
@@ -364,29 +417,18 @@ def regenerate_video(video_id):
         # Get video
         video = video_model.get_video(video_id)
         if not video or not video.get('original_path'):
-            return Response(
-                f"data: {json.dumps({'error': 'Video not found'})}\n\n",
-                mimetype='text/event-stream',
-                headers={
-                    'Content-Type': 'text/event-stream',
-                    'Cache-Control': 'no-cache',
-                    'Connection': 'keep-alive',
-                    'X-Accel-Buffering': 'no',
-                    'Access-Control-Allow-Origin': request.headers.get('Origin', '*'),
-                    'Access-Control-Allow-Credentials': 'true'
-                }
-            )
+            return _sse_error('Video not found')
 
         def generate():
-            vs = current_app.video_service
+            vs = get_video_service()
             srt_path = None
             try:
                 # Generate SRT
-                yield f"data: {json.dumps({'step': 'Generating subtitles', 'progress': 30})}\n\n"
+                yield _sse_json({'step': 'Generating subtitles', 'progress': 30})
                 srt_path = vs._generate_srt(segments, target_lang)
 
                 # Burn subtitles
-                yield f"data: {json.dumps({'step': 'Processing video', 'progress': 60})}\n\n"
+                yield _sse_json({'step': 'Processing video', 'progress': 60})
                 output_path = vs._burn_subtitles(
                     video['original_path'],
                     srt_path,
@@ -395,8 +437,9 @@ def regenerate_video(video_id):
                 )
 
                 # Update database
-                yield f"data: {json.dumps({'step': 'Finalizing', 'progress': 90})}\n\n"
+                yield _sse_json({'step': 'Finalizing', 'progress': 90})
                 video_model.update_output_path(video_id, output_path, segments)
+                _invalidate_video(video_id)
 
                 # Final event
                 completed_data = {
@@ -405,12 +448,12 @@ def regenerate_video(video_id):
                     'output_path': output_path,
                     'segments': segments
                 }
-                yield f"data: {json.dumps(completed_data)}\n\n"
+                yield _sse_json(completed_data)
 
             except Exception as e:
                 logger.error(f"Regeneration failed: {str(e)}")
                 error_data = {'error': str(e), 'progress': -1}
-                yield f"data: {json.dumps(error_data)}\n\n"
+                yield _sse_json(error_data)
             finally:
                 if srt_path and os.path.exists(srt_path):
                     try:
@@ -419,46 +462,8 @@ def regenerate_video(video_id):
                     except Exception as e:
                         logger.warning(f"Error cleaning up SRT: {str(e)}")
 
-        return Response(
-            stream_with_context(generate()),
-            mimetype='text/event-stream',
-            headers={
-                'Content-Type': 'text/event-stream',
-                'Cache-Control': 'no-cache',
-                'Connection': 'keep-alive',
-                'X-Accel-Buffering': 'no',
-                'Access-Control-Allow-Origin': request.headers.get('Origin', '*'),
-                'Access-Control-Allow-Credentials': 'true'
-            }
-        )
+        return _sse_response(stream_with_context(generate()))
 
     except Exception as e:
         logger.error(f"Regeneration endpoint error: {str(e)}")
-        return Response(
-            f"data: {json.dumps({'error': 'Server error'})}\n\n",
-            mimetype='text/event-stream',
-            status=500,
-            headers={
-                'Content-Type': 'text/event-stream',
-                'Cache-Control': 'no-cache',
-                'Connection': 'keep-alive',
-                'X-Accel-Buffering': 'no',
-                'Access-Control-Allow-Origin': request.headers.get('Origin', '*'),
-                'Access-Control-Allow-Credentials': 'true'
-            }
-        )
-
-@video_bp.after_request
-def add_cors_headers(response):
-    response.headers['Access-Control-Allow-Origin'] = request.headers.get('Origin', '*')
-    response.headers['Access-Control-Allow-Credentials'] = 'true'
-    response.headers['Access-Control-Allow-Methods'] = 'GET, POST, PUT, DELETE, OPTIONS'
-    response.headers['Access-Control-Allow-Headers'] = 'Content-Type, Authorization'
-    response.headers['Access-Control-Expose-Headers'] = 'Content-Disposition'
-    return response
-
-@video_bp.route('', methods=['OPTIONS'])
-@video_bp.route('/<path:path>', methods=['OPTIONS'])
-def handle_preflight(path=None):
-    response = make_response()
-    return add_cors_headers(response)
\ No newline at end of file
+        return _sse_error('Server error', status=500)
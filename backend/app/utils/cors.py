@@ -0,0 +1,46 @@
+# Shared by every CORS response; built once at import
+_SHARED_HEADERS = [
+    ('Access-Control-Allow-Credentials', "true"),
+    # "*" is ignored on credentialed requests, so name the download filename header too
+    ('Access-Control-Expose-Headers', "Content-Disposition, *"),
+    ('Vary', "Origin")
+]
+_PREFLIGHT_HEADERS = [
+    ('Access-Control-Allow-Methods', "GET, POST, PUT, DELETE, OPTIONS, PATCH"),
+    ('Access-Control-Max-Age', "3600"),
+    ('Content-Length', "0")
+]
+
+class FastCORS:
+    """WSGI middleware applying a fixed CORS policy to one path prefix.
+
+    Preflight requests are answered before they reach Flask. Other responses
+    get the CORS headers appended unless the app already set its own.
+    """
+
+    def __init__(self, app, origins, path_prefix='/api/'):
+        self.app = app
+        self.origins = frozenset(origins)
+        self.path_prefix = path_prefix
+
+    def __call__(self, environ, start_response):
+        origin = environ.get('HTTP_ORIGIN')
+        if origin not in self.origins or not environ.get('PATH_INFO', '').startswith(self.path_prefix):
+            return self.app(environ, start_response)
+
+        cors_headers = [('Access-Control-Allow-Origin', origin)] + _SHARED_HEADERS
+
+        if environ['REQUEST_METHOD'] == 'OPTIONS' and 'HTTP_ACCESS_CONTROL_REQUEST_METHOD' in environ:
+            headers = cors_headers + _PREFLIGHT_HEADERS
+            requested_headers = environ.get('HTTP_ACCESS_CONTROL_REQUEST_HEADERS')
+            if requested_headers:
+                headers.append(('Access-Control-Allow-Headers', requested_headers))
+            start_response('200 OK', headers)
+            return [b'']
+
+        def cors_start_response(status, headers, exc_info=None):
+            if not any(name.lower() == 'access-control-allow-origin' for name, _ in headers):
+                headers = list(headers) + cors_headers
+            return start_response(status, headers, exc_info)
+
+        return self.app(environ, cors_start_response)
@@ -1,4 +1,5 @@
 import os
+from functools import lru_cache
 from langdetect import detect
 from typing import Optional
 
@@ -18,7 +19,13 @@ LANGUAGE_NAME_MAP = {
     'russian': 'ru',
     'hindi': 'hi'
 }
+_FONTS_DIR = os.path.realpath(os.path.join(os.path.dirname(__file__), '..', 'assets', 'fonts'))
+_FONTS_VERIFIED = False
 
+# Names and already-normalized codes folded into one lookup table
+_NORMALIZED_CODES = {**LANGUAGE_NAME_MAP, **{code: code for code in LANGUAGE_NAME_MAP.values()}}
+
+@lru_cache(maxsize=512)
 def normalize_lang_code(lang: str) -> str:
     """
     Normalize language names and codes to ISO 639-1 format.
@@ -30,17 +37,12 @@ def normalize_lang_code(lang: str) -> str:
         str: Normalized 2-letter language code
     """
     lang = lang.strip().lower()
-    
-    # Check if it's already a valid 2-letter code
-    if len(lang) == 2 and lang in LANGUAGE_NAME_MAP.values():
-        return lang
-    
-    # Check if it's a locale code (e.g. en-US)
+
+    # Locale codes (e.g. en-US) normalize by their language part
     if '-' in lang:
-        lang = lang.split('-')[0]
-    
-    # Map common language names to codes
-    return LANGUAGE_NAME_MAP.get(lang, lang)
+        lang = lang.split('-', 1)[0]
+
+    return _NORMALIZED_CODES.get(lang, lang)
 
 def is_rtl_language(lang_code: str) -> bool:
     """
@@ -48,12 +50,16 @@ def is_rtl_language(lang_code: str) -> bool:
     """
     return normalize_lang_code(lang_code) in RTL_LANGUAGES
 
+@lru_cache(maxsize=32)
 def get_font_path(lang_code: str) -> str:
     """
     Get the appropriate font path for a given language code.
+
+    Fonts don't change at runtime, so results are memoized; misses raise
+    and are retried on the next call.
     """
     normalized_code = normalize_lang_code(lang_code)
-    fonts_dir = os.path.join(os.path.dirname(__file__), '..', 'assets', 'fonts')
+    fonts_dir = _FONTS_DIR
     
     if not os.path.exists(fonts_dir):
         raise FileNotFoundError(f"Fonts directory not found: {fonts_dir}")
@@ -94,8 +100,14 @@ def detect_language(text: str) -> str:
 def verify_fonts_exist() -> bool:
     """
     Verify that all required font files exist.
+
+    A successful check is remembered; a failing one is re-run on each call.
     """
-    fonts_dir = os.path.join(os.path.dirname(__file__), '..', 'assets', 'fonts')
+    global _FONTS_VERIFIED
+    if _FONTS_VERIFIED:
+        return True
+
+    fonts_dir = _FONTS_DIR
     required_fonts = [
         'NotoSans-Regular.ttf',
         'NotoSansHebrew-Regular.ttf',
@@ -109,11 +121,12 @@ def verify_fonts_exist() -> bool:
     if missing:
         print(f"Missing fonts: {', '.join(missing)}")
         return False
+    _FONTS_VERIFIED = True
     return True
 
 def init_fonts() -> None:
 
-    fonts_dir = os.path.join(os.path.dirname(__file__), '..', 'assets', 'fonts')
+    fonts_dir = _FONTS_DIR
     
     try:
         os.makedirs(fonts_dir, exist_ok=True)
@@ -127,6 +140,3 @@ def init_fonts() -> None:
     except Exception as e:
         print(f"Font initialization error: {str(e)}")
         raise
-
-# Additional validation on import
-init_fonts()
\ No newline at end of file
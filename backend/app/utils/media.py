@@ -0,0 +1,51 @@
+import os
+from fractions import Fraction
+from functools import lru_cache
+from typing import NamedTuple, Optional
+import ffmpeg
+
+class VideoInfo(NamedTuple):
+    width: int
+    height: int
+    duration: float
+    audio_codec: Optional[str]
+    frame_rate: Optional[Fraction]
+    frame_count: int
+
+def probe_video(path: str) -> VideoInfo:
+    """ffprobe a video, reusing the result until the file's mtime or size changes"""
+    stat = os.stat(path)
+    return _probe_cached(os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+
+@lru_cache(maxsize=256)
+def _probe_cached(path: str, mtime_ns: int, size: int) -> VideoInfo:
+    probe = ffmpeg.probe(path)
+    video_stream = next(s for s in probe['streams'] if s['codec_type'] == 'video')
+    audio_stream = next((s for s in probe['streams'] if s['codec_type'] == 'audio'), None)
+    duration = float(probe['format'].get('duration', 0))
+    frame_rate = _parse_rate(video_stream.get('avg_frame_rate')) or _parse_rate(video_stream.get('r_frame_rate'))
+    nb_frames = video_stream.get('nb_frames')
+    if nb_frames and nb_frames.isdigit():
+        frame_count = int(nb_frames)
+    else:
+        # Containers like mkv/webm don't store a frame count
+        frame_count = round(duration * frame_rate) if frame_rate else 0
+    return VideoInfo(
+        width=int(video_stream['width']),
+        height=int(video_stream['height']),
+        duration=duration,
+        audio_codec=audio_stream['codec_name'] if audio_stream else None,
+        frame_rate=frame_rate,
+        frame_count=frame_count
+    )
+
+def _parse_rate(rate: Optional[str]) -> Optional[Fraction]:
+    """Parse an ffprobe rate like '30000/1001'; None for missing or '0/0'"""
+    try:
+        value = Fraction(rate)
+    except (TypeError, ValueError, ZeroDivisionError):
+        return None
+    return value if value > 0 else None
+
+def clear_probe_cache() -> None:
+    _probe_cached.cache_clear()
@@ -0,0 +1,33 @@
+import hashlib
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from cachetools import TTLCache
+from app.extensions import bcrypt
+
+# Recent (hash, password) verification results; negatives are kept too so a
+# burst of bad logins against one account doesn't pay for bcrypt every time
+_check_cache = TTLCache(maxsize=1024, ttl=30)
+_check_cache_lock = threading.Lock()
+
+# bcrypt releases the GIL, so hashes run truly in parallel here; capping the
+# pool at the core count keeps a login burst from oversubscribing the CPU
+_hash_pool = ThreadPoolExecutor(max_workers=os.cpu_count() or 1, thread_name_prefix='vidsub-bcrypt')
+
+def hash_password(password: str) -> str:
+    """bcrypt-hash a password on the shared hashing pool."""
+    return _hash_pool.submit(bcrypt.generate_password_hash, password).result().decode('utf-8')
+
+def check_password(password_hash: str, password: str) -> bool:
+    """Check a password against its bcrypt hash, memoizing recent results."""
+    key = hashlib.blake2b(
+        password_hash.encode('utf-8') + b":" + hashlib.sha256(password.encode('utf-8')).digest()
+    ).digest()
+
+    with _check_cache_lock:
+        result = _check_cache.get(key)
+    if result is None:
+        result = _hash_pool.submit(bcrypt.check_password_hash, password_hash, password).result()
+        with _check_cache_lock:
+            _check_cache[key] = result
+    return result
@@ -0,0 +1,41 @@
+import threading
+from cachetools import LRUCache
+from werkzeug.routing import Map
+from werkzeug.routing.matcher import StateMachineMatcher
+
+class CachingMatcher(StateMachineMatcher):
+    """State machine matcher that remembers successful (host, path, method) matches.
+
+    REST clients hit the same handful of URLs repeatedly, so a hit skips the
+    state machine walk and converter calls. Misses, redirects and 404/405s
+    always go through the normal matcher so error handling is unchanged.
+    """
+
+    def __init__(self, merge_slashes, maxsize=2048):
+        super().__init__(merge_slashes)
+        self._match_cache = LRUCache(maxsize=maxsize)
+        self._match_cache_lock = threading.Lock()
+
+    def add(self, rule):
+        super().add(rule)
+        with self._match_cache_lock:
+            self._match_cache.clear()
+
+    def match(self, domain, path, method, websocket):
+        key = (domain, path, method, websocket)
+        with self._match_cache_lock:
+            cached = self._match_cache.get(key)
+        if cached is not None:
+            rule, values = cached
+            # View args may be mutated by url_value_preprocessors
+            return rule, dict(values)
+
+        rule, values = super().match(domain, path, method, websocket)
+        with self._match_cache_lock:
+            self._match_cache[key] = (rule, dict(values))
+        return rule, values
+
+class CachingMap(Map):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._matcher = CachingMatcher(self.merge_slashes)
@@ -1,15 +1,24 @@
 import os
 import urllib.request
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Optional
 
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
 def download_file(url: str, output_path: str) -> bool:
     """Download a file from URL to the specified path."""
+    partial_path = output_path + '.part'
     try:
-        urllib.request.urlretrieve(url, output_path)
+        # Stream to a side file so an interrupted download never looks like an installed font
+        with urllib.request.urlopen(url) as response, open(partial_path, 'wb') as f:
+            shutil.copyfileobj(response, f, DOWNLOAD_CHUNK_SIZE)
+        os.replace(partial_path, output_path)
         return True
     except Exception as e:
         print(f"Error downloading {url}: {str(e)}")
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
         return False
 
 def setup_fonts() -> None:
@@ -28,18 +37,27 @@ def setup_fonts() -> None:
     
     print(f"Setting up fonts in: {fonts_dir}")
     
+    missing = {}
     for font_name, url in font_urls.items():
         font_path = os.path.join(fonts_dir, font_name)
         
         if os.path.exists(font_path):
             print(f"{font_name} already exists, skipping...")
             continue
-            
+        missing[font_name] = (url, font_path)
+
+    def fetch(font_name: str) -> None:
+        url, font_path = missing[font_name]
         print(f"Downloading {font_name}...")
         if download_file(url, font_path):
             print(f"Successfully downloaded {font_name}")
         else:
             print(f"Failed to download {font_name}")
+
+    # Downloads are network-bound, so fetch them all at once
+    if missing:
+        with ThreadPoolExecutor(max_workers=min(8, len(missing))) as pool:
+            list(pool.map(fetch, missing))
     
     # Special instructions for CJK font
     cjk_font_path = os.path.join(fonts_dir, 'NotoSansCJK-Regular.ttc')
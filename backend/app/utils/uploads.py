@@ -0,0 +1,50 @@
+import os
+import tempfile
+from typing import Dict
+from flask import current_app
+from flask.wrappers import Request
+from werkzeug.datastructures import FileStorage
+
+
+class SpoolingRequest(Request):
+    """Request that spools multipart file parts straight into the upload folder.
+
+    Werkzeug normally parses uploads into an anonymous temp file that the view
+    then copies to its destination. When ``UPLOAD_SPOOL_DIR`` is configured the
+    part is written to a named file in that directory instead, so the view can
+    rename it into place (same filesystem) without reading it back. Spooled
+    files that are never claimed are removed when the request closes.
+    """
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        spool_dir = current_app.config.get('UPLOAD_SPOOL_DIR')
+        if not spool_dir or not filename:
+            return super()._get_file_stream(total_content_length, content_type, filename, content_length)
+
+        stream = tempfile.NamedTemporaryFile(dir=spool_dir, prefix='.upload-', suffix='.part', delete=False)
+        self._spooled_files[stream.name] = stream
+        return stream
+
+    @property
+    def _spooled_files(self) -> Dict[str, object]:
+        return self.__dict__.setdefault('_spooled', {})
+
+    def claim_spooled_file(self, file: FileStorage, destination: str) -> bool:
+        """Rename a spooled upload to ``destination``; False if it wasn't spooled to disk."""
+        path = getattr(file.stream, 'name', None)
+        if not isinstance(path, str) or path not in self._spooled_files:
+            return False
+        file.stream.flush()
+        os.replace(path, destination)
+        del self._spooled_files[path]
+        return True
+
+    def close(self) -> None:
+        super().close()
+        for path, stream in self._spooled_files.items():
+            stream.close()
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        self._spooled_files.clear()
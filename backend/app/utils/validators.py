@@ -1,22 +1,28 @@
 import re
 from flask import current_app
 
+_UPPERCASE_RE = re.compile(r'[A-Z]')
+_LOWERCASE_RE = re.compile(r'[a-z]')
+_DIGIT_RE = re.compile(r'\d')
+_SPECIAL_CHARS = frozenset('!@#$%^&*(),.?":{}|<>')
+
 def validate_password(password):
     errors = []
+    config = current_app.config
 
-    if len(password) < current_app.config['PASSWORD_MIN_LENGTH']:
-        errors.append(f"Password must be at least {current_app.config['PASSWORD_MIN_LENGTH']} characters long.")
+    if len(password) < config['PASSWORD_MIN_LENGTH']:
+        errors.append(f"Password must be at least {config['PASSWORD_MIN_LENGTH']} characters long.")
 
-    if current_app.config['PASSWORD_REQUIRE_UPPERCASE'] and not re.search(r'[A-Z]', password):
+    if config['PASSWORD_REQUIRE_UPPERCASE'] and not _UPPERCASE_RE.search(password):
         errors.append("Password must contain at least one uppercase letter.")
 
-    if current_app.config['PASSWORD_REQUIRE_LOWERCASE'] and not re.search(r'[a-z]', password):
+    if config['PASSWORD_REQUIRE_LOWERCASE'] and not _LOWERCASE_RE.search(password):
         errors.append("Password must contain at least one lowercase letter.")
 
-    if current_app.config['PASSWORD_REQUIRE_DIGIT'] and not re.search(r'\d', password):
+    if config['PASSWORD_REQUIRE_DIGIT'] and not _DIGIT_RE.search(password):
         errors.append("Password must contain at least one number.")
 
-    if current_app.config['PASSWORD_REQUIRE_SPECIAL_CHAR'] and not re.search(r'[!@#$%^&*(),.?":{}|<>]', password):
+    if config['PASSWORD_REQUIRE_SPECIAL_CHAR'] and _SPECIAL_CHARS.isdisjoint(password):
         errors.append("Password must contain at least one special character.")
 
-    return errors
\ No newline at end of file
+    return errors
@@ -1,20 +1,67 @@
 import os
 from datetime import timedelta
+from types import MappingProxyType
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Frozen snapshot of the environment (including .env) taken once at import
+_ENV = MappingProxyType(dict(os.environ))
+
 class Config:
     # Basic Flask configuration
-    SECRET_KEY = os.environ.get('SECRET_KEY')
-    FLASK_DEBUG = os.environ.get('FLASK_DEBUG', 'development')
+    SECRET_KEY = _ENV.get('SECRET_KEY')
+    FLASK_DEBUG = _ENV.get('FLASK_DEBUG', 'development')
     
     # MongoDB configuration
-    MONGODB_URI = os.environ.get('MONGODB_URI')
+    MONGODB_URI = _ENV.get('MONGODB_URI')
+    
+    # Groq API
+    GROQ_API_KEY = _ENV.get('GROQ_API_KEY')
+    
+    # Translation models loaded in the gunicorn master before forking, e.g. "en-es,fr-en"
+    PRELOAD_TRANSLATION_PAIRS = _ENV.get('VIDSUB_PRELOAD_PAIRS', '')
+    # Translation models loaded in a background thread of each process, e.g. "en-es,en-fr,fr-en"
+    WARMUP_TRANSLATION_PAIRS = _ENV.get('VIDSUB_WARMUP_PAIRS', '')
+    # Set to "int8" to quantize translation models' linear layers on load
+    TRANSLATION_QUANTIZATION = _ENV.get('TRANSLATION_QUANTIZATION', '')
+    # Memory budget for cached translation models; least recently used are evicted past it
+    MODEL_CACHE_MB = int(_ENV.get('VIDSUB_MODEL_CACHE_MB', 8192))
+    # "ctranslate2" runs MarianMT as int8 CTranslate2 models and "onnx" as graph-optimized
+    # ONNX Runtime models, both converted on first use
+    TRANSLATION_BACKEND = _ENV.get('TRANSLATION_BACKEND', 'transformers')
+    # Beam search instead of greedy decoding: better translations, several times slower
+    TRANSLATION_QUALITY = _ENV.get('TRANSLATION_QUALITY', '').lower() in ('1', 'true', 'yes')
+    CT2_MODEL_DIR = _ENV.get('CT2_MODEL_DIR', os.path.join(os.path.expanduser('~'), '.cache', 'vidsub', 'ct2'))
+    ONNX_MODEL_DIR = _ENV.get('ONNX_MODEL_DIR', os.path.join(os.path.expanduser('~'), '.cache', 'vidsub', 'onnx'))
+
+    # libx264 settings for subtitle burn-in
+    X264_PRESET = _ENV.get('X264_PRESET', 'faster')
+    X264_CRF = int(_ENV.get('X264_CRF', 20))
+    # Regeneration re-encodes use constant QP unless X264_REGEN_CRF=1
+    X264_REGEN_QP = int(_ENV.get('X264_REGEN_QP', 20))
+    X264_REGEN_CRF = _ENV.get('X264_REGEN_CRF', '').lower() in ('1', 'true', 'yes')
+    # Fixed GOP length in frames; skips scene-cut detection and keeps seeking cheap. 0 leaves it to the encoder
+    VIDEO_GOP = int(_ENV.get('VIDEO_GOP', 120))
+    # x264 tune (film, animation, ...); empty to disable
+    X264_TUNE = _ENV.get('X264_TUNE', 'film')
+    # "auto" uses the first working hardware H.264 encoder (nvenc, qsv, videotoolbox), else libx264
+    VIDEO_ENCODER = _ENV.get('VIDEO_ENCODER', 'auto')
+    # Concurrent ffmpeg encodes per process; each encode already uses every core
+    MAX_CONCURRENT_ENCODES = int(_ENV.get('MAX_CONCURRENT_ENCODES', 2))
+    # Videos longer than this are split into PARALLEL_ENCODE_SEGMENTS slices encoded side by side
+    PARALLEL_ENCODE_SEGMENTS = int(_ENV.get('PARALLEL_ENCODE_SEGMENTS', 4))
+    PARALLEL_ENCODE_MIN_SECONDS = float(_ENV.get('PARALLEL_ENCODE_MIN_SECONDS', 600))
     
     # JWT configuration
-    JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY')
+    JWT_SECRET_KEY = _ENV.get('JWT_SECRET_KEY')
+    JWT_ALGORITHM = _ENV.get('JWT_ALGORITHM', 'HS256')
+    # PEM keys, only used with RS*/ES*/PS* algorithms
+    JWT_PRIVATE_KEY = _ENV.get('JWT_PRIVATE_KEY')
+    JWT_PUBLIC_KEY = _ENV.get('JWT_PUBLIC_KEY')
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=24)
+    JWT_CACHE_TTL = int(_ENV.get('JWT_CACHE_TTL', 5))
+    JWT_CACHE_MAX = int(_ENV.get('JWT_CACHE_MAX', 10000))
     
     # CORS Settings
     CORS_ORIGINS = ["http://127.0.0.1:5000", "http://localhost:3000"]
@@ -29,6 +76,9 @@ class Config:
     PASSWORD_REQUIRE_DIGIT = True
     PASSWORD_REQUIRE_SPECIAL_CHAR = True
 
+    # Check the subtitle fonts once in create_app; set VIDSUB_INIT_FONTS=0 to skip
+    INIT_FONTS = _ENV.get('VIDSUB_INIT_FONTS', '1').lower() in ('1', 'true', 'yes')
+
     # Uploads and output
     UPLOAD_FOLDER = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'uploads')
     OUTPUT_FOLDER = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'output')
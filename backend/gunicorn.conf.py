@@ -0,0 +1,42 @@
+# Gunicorn settings for production serving:
+#   gunicorn -c gunicorn.conf.py run:app
+import os
+
+bind = os.environ.get('GUNICORN_BIND', '127.0.0.1:5000')
+workers = int(os.environ.get('GUNICORN_WORKERS', 2))
+
+# Uploads, ffmpeg renders and Groq calls all block outside the GIL, so
+# threads let one worker overlap many of them instead of serializing.
+# Green-thread workers (gevent/eventlet) are not supported: with preload_app
+# the service's locks, executors and warmup thread are created before the
+# worker monkey-patches, and then run under the patched hub
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 8))
+
+# SSE processing streams stay open for the whole render
+keepalive = 75
+
+# Import the app in the master so model weights loaded below are shared
+# copy-on-write by every forked worker instead of loaded once per worker
+preload_app = True
+
+def when_ready(server):
+    from config.settings import Config
+    from app.core.video_service import fork_safe_preload, get_video_service, parse_lang_pairs
+
+    pairs = parse_lang_pairs(Config.PRELOAD_TRANSLATION_PAIRS)
+    if pairs and not fork_safe_preload():
+        server.log.warning(
+            "Skipping translation model preload in the master: the %s backend on this device "
+            "does not survive fork; workers load the models after forking instead",
+            Config.TRANSLATION_BACKEND
+        )
+    elif pairs:
+        # Synchronous and without the warmup thread: the master must not fork with threads running
+        get_video_service(warmup=False).preload_translation_models(pairs)
+
+def post_fork(server, worker):
+    from app.core.video_service import get_video_service
+
+    # Background warmup runs in each worker, never in the master
+    get_video_service().start_warmup()
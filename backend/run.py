@@ -1,24 +1,48 @@
 from app import create_app
-from flask import send_from_directory
+from flask import Response, send_from_directory
 import os
 
 app = create_app()
 
+# Update path to point to correct out directory
+next_build_dir = os.environ.get('NEXT_BUILD_DIR', '/Users/visheshgowda/Downloads/video-subtitle-generator/out')
+
+def _scan_next_build(build_dir):
+    """Relative paths of every file in the static export, collected once at startup"""
+    files = set()
+    for root, _, names in os.walk(build_dir):
+        rel_root = os.path.relpath(root, build_dir)
+        for name in names:
+            rel_path = name if rel_root == '.' else os.path.join(rel_root, name)
+            files.add(rel_path.replace(os.sep, '/'))
+    return frozenset(files)
+
+def _read_index_html(build_dir):
+    try:
+        with open(os.path.join(build_dir, 'index.html'), 'rb') as f:
+            return f.read()
+    except OSError:
+        return None
+
+_NEXT_FILES = _scan_next_build(next_build_dir)
+_INDEX_HTML = _read_index_html(next_build_dir)
+
+# Content-hashed build output never changes under the same name
+_IMMUTABLE_PREFIX = '_next/static/'
+_IMMUTABLE_MAX_AGE = 31536000
+
 # Add route to serve Next.js static files
 @app.route('/', defaults={'path': ''})
 @app.route('/<path:path>')
 def serve_nextjs(path):
-    # Update path to point to correct out directory
-    next_build_dir = '/Users/visheshgowda/Downloads/video-subtitle-generator/out'
-    
-    if path == "":
-        return send_from_directory(next_build_dir, 'index.html')
-        
-    if os.path.exists(os.path.join(next_build_dir, path)):
-        return send_from_directory(next_build_dir, path)
-    
-    # Fallback to index.html for client-side routing
+    if path in _NEXT_FILES:
+        max_age = _IMMUTABLE_MAX_AGE if path.startswith(_IMMUTABLE_PREFIX) else None
+        return send_from_directory(next_build_dir, path, max_age=max_age)
+
+    # Root and client-side routes both get index.html
+    if _INDEX_HTML is not None:
+        return Response(_INDEX_HTML, mimetype='text/html')
     return send_from_directory(next_build_dir, 'index.html')
 
 if __name__ == '__main__':
-    app.run(debug=True, host='localhost', port=5000)
\ No newline at end of file
+    app.run(debug=True, host='localhost', port=5000)